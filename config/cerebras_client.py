@@ -3,13 +3,24 @@ from dotenv import load_dotenv; load_dotenv()
 from cerebras.cloud.sdk import Cerebras
 from crewai import LLM
 import os
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of nested kwargs (e.g. a response_format JSON schema) for cache keys."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class CerebrasConfig:
     """Configuration for Cerebras SDK."""
 
     _client: Optional[Cerebras] = None
-    _llm: Optional[LLM] = None
+    # Memoized LLM instances keyed by (model, temperature, base_url, kwargs)
+    _llm_cache: Dict[Tuple[Any, ...], LLM] = {}
     
     # Cerebras API endpoint (OpenAI-compatible). Defaults to public endpoint
     BASE_URL = os.getenv("CEREBRAS_BASE_URL")
@@ -37,30 +48,50 @@ class CerebrasConfig:
         cls,
         model: str = "cerebras/llama3.1-70b",
         temperature: float = 0.5,
+        base_url: Optional[str] = None,
         **kwargs,
     ) -> LLM:
         """
         Get CrewAI's LLM configured for Cerebras via LiteLLM.
         Mirrors the snippet:
             LLM(model="cerebras/llama3.1-70b", api_key=..., base_url="https://api.cerebras.ai/v1", ...)
+
+        Instances are memoized per configuration so repeated agent construction
+        reuses one LiteLLM client instead of rebuilding it on every call.
         """
-        api_key = os.getenv("CEREBRAS_API_KEY")
+        api_key = cls.API_KEY
         if not api_key:
             raise ValueError("CEREBRAS_API_KEY environment variable not set")
 
-        return LLM(
+        base_url = base_url or cls.BASE_URL
+        try:
+            cache_key = (model, temperature, base_url, _freeze(kwargs))
+            hash(cache_key)
+        except TypeError:
+            # Unhashable kwargs (e.g. callback objects) - build an uncached instance
+            cache_key = None
+
+        if cache_key is not None and cache_key in cls._llm_cache:
+            return cls._llm_cache[cache_key]
+
+        llm = LLM(
             model=model,
             api_key=api_key,
-            base_url=cls.BASE_URL,
+            base_url=base_url,
             temperature=temperature,
             **kwargs,
         )
+        if cache_key is not None:
+            cls._llm_cache[cache_key] = llm
+        return llm
 
     @classmethod
     def reset(cls):
-        """Reset instances (useful for testing)."""
+        """Reset instances and re-read environment settings (useful for testing)."""
+        cls.BASE_URL = os.getenv("CEREBRAS_BASE_URL")
+        cls.API_KEY = os.getenv("CEREBRAS_API_KEY")
         cls._client = None
-        cls._llm = None
+        cls._llm_cache.clear()
 
 
 # Convenience functions
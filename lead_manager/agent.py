@@ -2,56 +2,144 @@
 Main Lead Manager Agent - Orchestrates the complete email processing workflow.
 """
 
+import asyncio
 import json
 import logging
 import os
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Any, Dict, List, Optional
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# lead_manager.config loads the .env file once, so import it before modules that read env at import
+from lead_manager.config import get_config, SKIP_SENDER_SUFFIXES, SKIP_SUBJECT_PATTERN
 from crewai import Agent, Task, Crew
 from leads_finder.llm_config import get_crewai_llm
-from lead_manager.config import LeadManagerConfig
-from lead_manager.prompts import LEAD_MANAGER_PROMPT, EMAIL_ANALYZER_PROMPT, CALENDAR_ORGANIZER_PROMPT, POST_ACTION_PROMPT
+from lead_manager.prompts import LEAD_MANAGER_PROMPT, EMAIL_ANALYZER_PROMPT, POST_ACTION_PROMPT
 from lead_manager.tools.check_email_tool import CheckEmailTool
+from lead_manager.tools.mongodb_lead_tools import AnalyzerCache, analyzer_cache
 
 # Import sub-agents
-from lead_manager.sub_agents.email_checker_agent import run_email_checker
-from lead_manager.sub_agents.email_analyzer_agent import run_email_analyzer
-from lead_manager.sub_agents.calendar_organizer_agent import run_calendar_organizer
-from lead_manager.sub_agents.post_action_agent import run_post_action
+from lead_manager.sub_agents.email_checker_agent import stream_email_checker
+from lead_manager.sub_agents.email_analyzer_agent import run_email_analyzer, run_email_analyzer_batch
+from lead_manager.sub_agents.calendar_organizer_agent import run_calendar_organizer, fetch_availability
+from lead_manager.sub_agents.post_action_agent import build_post_action_record, flush_post_actions
 
 logger = logging.getLogger(__name__)
 
+# Static Agent definition, built once at import
+_ORCHESTRATOR_ROLE = "Lead Manager Orchestrator"
+_ORCHESTRATOR_GOAL = "Orchestrate complete email processing workflow from email monitoring to meeting scheduling"
+_ORCHESTRATOR_BACKSTORY = textwrap.dedent("""
+    You are the master orchestrator of an intelligent Lead Manager system that processes 
+    incoming emails, identifies hot leads through AI-powered content analysis, and automatically 
+    schedules meetings with qualified prospects. You coordinate four specialized sub-agents to 
+    ensure seamless workflow execution from email receipt to meeting confirmation.
+""")
+
+# Counters read by _generate_workflow_summary, in unpack order
+_SUMMARY_COUNT_KEYS = ("emails_processed", "hot_leads_found", "meetings_scheduled", "successful_processes")
+
+
+def _pct(numerator: float, denominator: float) -> float:
+    """Percentage rounded to 2 places, 0.0 when the denominator is zero."""
+    return round(100.0 * numerator / denominator, 2) if denominator else 0.0
+
+
+def _discard_task_result(task: "asyncio.Task") -> None:
+    """Done callback for abandoned tasks: mark any exception as retrieved so it is not reported."""
+    if not task.cancelled():
+        task.exception()
+
+
+# Per-email sub-agent payloads kept out of the slim detailed_results entries
+_DETAIL_PAYLOAD_KEYS = ("analysis_result", "meeting_result", "finalization_result")
+
+
+@dataclass
+class EmailRecord:
+    """Slotted view of the email fields the orchestrator reads on every step."""
+    
+    __slots__ = ("sender_email", "subject", "sender_name", "date_received", "message_id", "body")
+    
+    sender_email: str
+    subject: str
+    sender_name: str
+    date_received: str
+    message_id: str
+    body: str
+    
+    @classmethod
+    def from_dict(cls, email_data: Dict[str, Any]) -> "EmailRecord":
+        """Build a record from the email checker's dictionary output."""
+        return cls(
+            sender_email=email_data.get("sender_email") or "",
+            subject=email_data.get("subject") or "",
+            sender_name=email_data.get("sender_name") or "",
+            date_received=email_data.get("date_received") or "",
+            message_id=email_data.get("message_id") or "",
+            body=email_data.get("body") or ""
+        )
+
 
 class LeadManagerAgent:
     """Main orchestrating agent for the Lead Manager workflow."""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.config = LeadManagerConfig()
+        self.config = get_config()
+        self._agent = None
+        # Bounded pool for the blocking sub-agent calls (LLM, Gmail, Calendar, MongoDB);
+        # the work is I/O bound so threads release the GIL while waiting
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.config.MAX_WORKERS),
+            thread_name_prefix="lead-manager"
+        )
         
     def create_agent(self):
-        """Create the main Lead Manager Agent."""
+        """Create the main Lead Manager Agent (built once per instance and reused)."""
+        if self._agent is None:
+            self._agent = self._build_agent()
+        return self._agent
+    
+    def _build_agent(self):
+        """Build the CrewAI Agent; the LLM itself is memoized by get_crewai_llm."""
         return Agent(
-            role="Lead Manager Orchestrator",
-            goal="Orchestrate complete email processing workflow from email monitoring to meeting scheduling",
-            backstory="""
-            You are the master orchestrator of an intelligent Lead Manager system that processes 
-            incoming emails, identifies hot leads through AI-powered content analysis, and automatically 
-            schedules meetings with qualified prospects. You coordinate four specialized sub-agents to 
-            ensure seamless workflow execution from email receipt to meeting confirmation.
-            """,
+            role=_ORCHESTRATOR_ROLE,
+            goal=_ORCHESTRATOR_GOAL,
+            backstory=_ORCHESTRATOR_BACKSTORY,
             verbose=True,
             allow_delegation=True,
             tools=[CheckEmailTool()],
             llm=get_crewai_llm(model="cerebras/llama3.1-8b", temperature=0.1),
         )
     
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the agent's bounded thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+    
     def process_leads(self) -> Dict[str, Any]:
         """
-        Execute the complete Lead Manager workflow.
+        Execute the complete Lead Manager workflow (sync wrapper around aprocess_leads).
+        
+        Returns:
+            Dictionary with complete workflow results
+        """
+        return asyncio.run(self.aprocess_leads())
+    
+    async def aprocess_leads(self) -> Dict[str, Any]:
+        """
+        Execute the complete Lead Manager workflow, processing emails concurrently.
+        
+        Each email's analyzer → calendar → post-action chain is I/O bound (LLM,
+        Gmail, Calendar), so the workflow runs as a three-stage pipeline joined by
+        bounded queues: the Gmail stream feeds MAX_CONCURRENT_EMAILS analyzer
+        workers, which micro-batch the analyzer call and hand each analyzed email
+        to MAX_CONCURRENT_EMAILS flow workers for calendar scheduling. Calendar
+        availability is prefetched while each batch is analyzed. Gmail, LLM and
+        Calendar latency overlap instead of adding up.
         
         Returns:
             Dictionary with complete workflow results
@@ -62,60 +150,162 @@ class LeadManagerAgent:
             workflow_results = {
                 "workflow_started": True,
                 "emails_processed": 0,
+                "emails_filtered": 0,
                 "hot_leads_found": 0,
                 "meetings_scheduled": 0,
                 "successful_processes": 0,
                 "detailed_results": [],
+                "results_by_message_id": {},
                 "workflow_summary": {}
             }
             
-            # Step 1: Email Checker Agent - Retrieve unread emails
-            self.logger.info("Step 1: Checking for unread emails...")
-            emails_result = run_email_checker()
-            
-            if not emails_result.get("success", False):
-                self.logger.error("Failed to retrieve emails")
-                return _create_error_result("Email retrieval failed", emails_result.get("error", "Unknown error"))
-            
-            emails_data = emails_result.get("result", {})
-            unread_emails = emails_data.get("unread_emails", [])
+            # Step 1: Email Checker - stream unread emails into a bounded queue so analysis
+            # starts while later Gmail pages/messages are still downloading
+            self.logger.info("Step 1: Streaming unread emails...")
+            worker_count = max(1, self.config.MAX_CONCURRENT_EMAILS)
+            batch_size = max(1, self.config.ANALYZER_BATCH_SIZE)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * batch_size)
+            flow_queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * batch_size)
+            unread_emails: List[Dict[str, Any]] = []
+            # One slot reserved per email on arrival; workers fill their own index, so
+            # order stays deterministic under concurrency without any locking
+            email_results: List[Any] = []
+            emails_seen = 0
+            
+            async def produce() -> None:
+                nonlocal emails_seen
+                try:
+                    async for email_data in stream_email_checker():
+                        emails_seen += 1
+                        
+                        # Prefilter non-business emails before any per-email work
+                        if not self._should_process_email(email_data):
+                            workflow_results["emails_filtered"] += 1
+                            continue
+                        
+                        unread_emails.append(email_data)
+                        email_results.append(None)
+                        await queue.put(len(unread_emails) - 1)
+                finally:
+                    for _ in range(worker_count):
+                        await queue.put(None)
+            
+            async def consume() -> None:
+                finished = False
+                while not finished:
+                    index = await queue.get()
+                    if index is None:
+                        return
+                    
+                    # Micro-batch whatever else has already arrived for one analyzer call
+                    batch = [index]
+                    while len(batch) < batch_size and not queue.empty():
+                        next_index = queue.get_nowait()
+                        if next_index is None:
+                            finished = True
+                            break
+                        batch.append(next_index)
+                    
+                    emails = [unread_emails[i] for i in batch]
+                    
+                    # Speculatively prefetch availability while the batch is analyzed; only
+                    # emails that may need a meeting get it, and it is cancelled if none do
+                    availability_task = asyncio.create_task(self._run_blocking(fetch_availability))
+                    availability_task.add_done_callback(_discard_task_result)
+                    try:
+                        analyses = await self._batch_analyze_emails(emails)
+                    except BaseException:
+                        availability_task.cancel()
+                        raise
+                    
+                    prefetches = [
+                        availability_task if analysis_result is None or self._needs_meeting(analysis_result) else None
+                        for analysis_result in analyses
+                    ]
+                    if not any(prefetches):
+                        availability_task.cancel()
+                    
+                    for item in zip(batch, emails, analyses, prefetches):
+                        await flow_queue.put(item)
             
-            if not unread_emails:
+            async def analyze_stage() -> None:
+                try:
+                    await asyncio.gather(*(consume() for _ in range(worker_count)))
+                finally:
+                    for _ in range(worker_count):
+                        await flow_queue.put(None)
+            
+            async def run_flows() -> None:
+                while True:
+                    item = await flow_queue.get()
+                    if item is None:
+                        return
+                    
+                    i, email_data, analysis_result, availability_task = item
+                    self.logger.info("📧 Processing email %s: %s", i + 1, email_data.get('sender_email', 'Unknown'))
+                    try:
+                        email_results[i] = await self._process_email_according_to_flow(
+                            email_data, analysis_result, availability_task
+                        )
+                    except Exception as e:
+                        email_results[i] = e
+            
+            await asyncio.gather(produce(), analyze_stage(), *(run_flows() for _ in range(worker_count)))
+            
+            if not emails_seen:
                 self.logger.info("No unread emails found")
                 return self._create_no_emails_result()
             
-            workflow_results["emails_processed"] = len(unread_emails)
-            self.logger.info(f"Found {len(unread_emails)} unread emails")
+            # === STEP 7 (batched): one meeting insert and one mark-read call for all emails ===
+            pending_post_actions = [
+                (i, email_result.pop("post_action_record"))
+                for i, email_result in enumerate(email_results)
+                if isinstance(email_result, dict) and "post_action_record" in email_result
+            ]
+            if pending_post_actions:
+                finalization_results = await self._run_blocking(
+                    flush_post_actions, [record for _, record in pending_post_actions]
+                )
+                for (i, _), finalization_result in zip(pending_post_actions, finalization_results):
+                    email_results[i]["finalization_result"] = finalization_result
+                    email_results[i]["workflow_completed"] = finalization_result.get("success", False)
             
-            # Process each email through the workflow according to the flowchart
-            for i, email_data in enumerate(unread_emails):
-                try:
-                    self.logger.info(f"📧 Processing email {i+1}/{len(unread_emails)}: {email_data.get('sender_email', 'Unknown')}")
-                    
-                    email_result = self._process_email_according_to_flow(email_data)
-                    workflow_results["detailed_results"].append(email_result)
-                    
-                    # Update counters
-                    if email_result.get("hot_lead_detected"):
-                        workflow_results["hot_leads_found"] += 1
-                    if email_result.get("meeting_scheduled"):
-                        workflow_results["meetings_scheduled"] += 1
-                    if email_result.get("processed_successfully"):
-                        workflow_results["successful_processes"] += 1
-                        
-                except Exception as e:
-                    self.logger.error(f"❌ Error processing email {i+1}: {str(e)}")
-                    workflow_results["detailed_results"].append({
+            workflow_results["emails_processed"] = len(unread_emails)
+            self.logger.info("Processed %s business emails (%s filtered out)", len(unread_emails), workflow_results['emails_filtered'])
+            
+            # Aggregate counters in a single pass, slimming each slot in place; the large
+            # sub-agent payloads move to results_by_message_id
+            results_by_message_id = workflow_results["results_by_message_id"]
+            for i, (email_data, email_result) in enumerate(zip(unread_emails, email_results)):
+                if isinstance(email_result, Exception):
+                    self.logger.error("❌ Error processing email %s: %s", i + 1, email_result)
+                    email_results[i] = {
                         "email": email_data.get("sender_email", "Unknown"),
-                        "error": str(e),
+                        "error": str(email_result),
                         "processed_successful": False
-                    })
+                    }
+                    continue
+                
+                result_ref = email_data.get("message_id") or str(i)
+                payloads = {key: email_result.pop(key) for key in _DETAIL_PAYLOAD_KEYS if key in email_result}
+                if payloads:
+                    results_by_message_id[result_ref] = payloads
+                    email_result["result_ref"] = result_ref
+                
+                if email_result.get("hot_lead_detected"):
+                    workflow_results["hot_leads_found"] += 1
+                if email_result.get("meeting_scheduled"):
+                    workflow_results["meetings_scheduled"] += 1
+                if email_result.get("processed_successfully"):
+                    workflow_results["successful_processes"] += 1
+            
+            workflow_results["detailed_results"] = email_results
             
             # Generate comprehensive workflow summary
             workflow_results["workflow_summary"] = self._generate_workflow_summary(workflow_results)
             
             self.logger.info("Lead Manager workflow completed successfully!")
-            self.logger.info(f"Summary: {workflow_results['emails_processed']} emails, {workflow_results['hot_leads_found']} hot leads, {workflow_results['meetings_scheduled']} meetings scheduled")
+            self.logger.info("Summary: %s emails, %s hot leads, %s meetings scheduled", workflow_results['emails_processed'], workflow_results['hot_leads_found'], workflow_results['meetings_scheduled'])
             
             return {
                 "success": True,
@@ -124,44 +314,93 @@ class LeadManagerAgent:
             }
             
         except Exception as e:
-            self.logger.error(f"Fatal error in Lead Manager workflow: {str(e)}")
+            self.logger.error("Fatal error in Lead Manager workflow: %s", e)
             return _create_error_result("Workflow execution failed", str(e))
     
+    async def _batch_analyze_emails(self, emails: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Resolve analyzer results for business emails before the per-email flow.
+        
+        Emails are expected to be prefiltered with _should_process_email. Cached
+        analyses are reused; the remaining emails are sent to the analyzer in batches
+        of ANALYZER_BATCH_SIZE, one LLM call per batch. Failed batches are left as
+        None so the flow analyzes those emails individually.
+        
+        Returns:
+            Analysis results index-aligned with emails
+        """
+        analyses: List[Optional[Dict[str, Any]]] = [None] * len(emails)
+        pending = []
+        
+        for i, email_data in enumerate(emails):
+            cache_key = AnalyzerCache.make_key(email_data)
+            cached_result = await self._run_blocking(analyzer_cache.get, cache_key)
+            if cached_result is not None:
+                analyses[i] = cached_result
+            else:
+                pending.append((i, cache_key))
+        
+        if not pending:
+            return analyses
+        
+        batch_size = max(1, self.config.ANALYZER_BATCH_SIZE)
+        batches = [pending[j:j + batch_size] for j in range(0, len(pending), batch_size)]
+        semaphore = asyncio.Semaphore(max(1, self.config.MAX_CONCURRENT_EMAILS))
+        
+        async def analyze_batch(batch):
+            async with semaphore:
+                return await self._run_blocking(run_email_analyzer_batch, [emails[i] for i, _ in batch])
+        
+        self.logger.info("🔍 Batch analyzing %s emails in %s LLM call(s)", len(pending), len(batches))
+        batch_results = await asyncio.gather(*(analyze_batch(batch) for batch in batches), return_exceptions=True)
+        
+        for batch, results in zip(batches, batch_results):
+            if isinstance(results, Exception):
+                self.logger.error("❌ Batch analysis failed: %s", results)
+                continue
+            
+            for (i, cache_key), analysis_result in zip(batch, results):
+                analyses[i] = analysis_result
+                if analysis_result.get("success", False):
+                    await self._run_blocking(analyzer_cache.put, cache_key, analysis_result)
+        
+        return analyses
+    
     def _should_process_email(self, email_data: Dict[str, Any]) -> bool:
         """Filter emails to only process business-related emails."""
         sender_email = email_data.get("sender_email", "").lower()
         subject = email_data.get("subject", "").lower()
         
-        # Skip automated/system emails
-        skip_domains = [
-            "noreply@", "no-reply@", "notification@", "admin@",
-            "cloudplatform-noreply@google.com", "analytics-noreply@google.com",
-            "accounts-noreply@google.com", "support@", "bounce@", "mail-noreply@",
-            "news@", "marketing@", "updates@"
-        ]
-        
-        skip_keywords = [
-            "verify your account", "account verification",
-            "payment required", "billing notification", "system maintenance",
-            "security alert", "password reset", "two-factor authentication",
-            "spam warning", "virus detected"
-        ]
-        
-        # Check if it's from a skip domain
-        for skip_domain in skip_domains:
-            if skip_domain in sender_email:
-                return False
+        # Skip automated/system emails (O(1) local-part lookup, suffix check for "*-noreply@")
+        local_part = sender_email.split("@", 1)[0]
+        if local_part in self.config.SKIP_SENDER_LOCAL_PARTS or local_part.endswith(SKIP_SENDER_SUFFIXES):
+            return False
         
         # Check if it contains skip keywords
-        for skip_keyword in skip_keywords:
-            if skip_keyword in subject:
-                return False
+        if SKIP_SUBJECT_PATTERN.search(subject):
+            return False
                 
         return True
 
-    def _process_email_according_to_flow(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _log_email_banner(self, email: EmailRecord) -> None:
+        """Show the email being processed (skips the formatting when INFO is suppressed)."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        print(f"\n📧 PROCESSING EMAIL:")
+        print(f"   👤 From: {email.sender_name or 'Unknown'} ({email.sender_email})")
+        print(f"   📝 Subject: {email.subject or 'No Subject'}")
+        print(f"   📅 Date: {email.date_received or 'Unknown'}")
+        print(f"   🔗 Message ID: {email.message_id or 'Unknown'}")
+        print(f"   ✅ DECISION: PROCESSING - Business email")
+        print(f"   🔄 Starting Sequential Workflow...")
+        self.logger.info("📧 SEQUENTIAL WORKFLOW: %s", email.sender_email)
+    
+    async def _process_email_according_to_flow(self, email_data: Dict[str, Any],
+                                               analysis_result: Optional[Dict[str, Any]] = None,
+                                               availability_task: Optional["asyncio.Future"] = None) -> Dict[str, Any]:
         """
-        Process a single email according to the exact flowchart sequence:
+        Process a single (prefiltered business) email according to the exact flowchart sequence:
         1. Email Checker Agent → Email Data (already done)
         2. Email Analyzer Agent → Hot Lead Detection
         3. Decision: Hot Lead? → Yes: UI Notification
@@ -169,46 +408,56 @@ class LeadManagerAgent:
         5. Decision: Meeting Request? → Yes: Calendar Organizer Agent
         6. Calendar Organizer Agent → Check Availability + Create Meeting
         7. Post Action Agent → Mark Email Read + Save Meeting Data + Final Notifications
+        
+        analysis_result may be supplied from a batched analyzer run; otherwise the
+        email is analyzed here (via the analyzer cache). availability_task is the
+        batch stage's availability prefetch, which may be shared with other emails.
         """
         try:
-            sender_email = email_data.get("sender_email", "")
+            email = EmailRecord.from_dict(email_data)
+            sender_email = email.sender_email
             
-            # Show email details being processed
-            subject = email_data.get("subject", "No Subject")
-            sender_name = email_data.get("sender_name", "Unknown")
-            print(f"\n📧 PROCESSING EMAIL:")
-            print(f"   👤 From: {sender_name} ({sender_email})")
-            print(f"   📝 Subject: {subject}")
-            print(f"   📅 Date: {email_data.get('date_received', 'Unknown')}")
-            print(f"   🔗 Message ID: {email_data.get('message_id', 'Unknown')}")
-            
-            # Check if we should process this email
-            if not self._should_process_email(email_data):
-                print(f"   ⏭️ DECISION: SKIPPING - Non-business email")
-                print(f"   📋 Flow: Email Checker → Filtered Out")
-                self.logger.info(f"⏭️ Skipping non-business email: {sender_email}")
-                return {
-                    "sender_email": sender_email,
-                    "processed_successful": False,
-                    "skipped": True,
-                    "reason": "Non-business email",
-                    "hot_lead_detected": False,
-                    "meeting_request_detected": False,
-                    "meeting_scheduled": False,
-                    "workflow_steps_completed": ["email_checker", "filtered_out"]
-                }
-            
-            print(f"   ✅ DECISION: PROCESSING - Business email")
-            print(f"   🔄 Starting Sequential Workflow...")
-            
-            self.logger.info(f"📧 SEQUENTIAL WORKFLOW: {sender_email}")
+            self._log_email_banner(email)
             
             # === STEP 1: Email Checker Agent ✅ (Already completed) ===
-            self.logger.info(f"🔄 STEP 1: Email Checker Agent ✅ COMPLETED")
+            self.logger.info("🔄 STEP 1: Email Checker Agent ✅ COMPLETED")
             
             # === STEP 2: Email Analyzer Agent (RANK NEXT) ===
-            self.logger.info(f"🔍 STEP 2: Email Analyzer Agent → ANALYZING...")
-            analysis_result = run_email_analyzer(email_data)
+            self.logger.info("🔍 STEP 2: Email Analyzer Agent → ANALYZING...")
+            owned_task = None
+            availability_result = None
+            try:
+                if analysis_result is None:
+                    # Speculatively prefetch calendar availability while the analyzer runs;
+                    # it is shared through a short TTL cache and discarded if unused
+                    if availability_task is None:
+                        availability_task = owned_task = asyncio.create_task(self._run_blocking(fetch_availability))
+                    cache_key = AnalyzerCache.make_key(email_data)
+                    analysis_result = await self._run_blocking(analyzer_cache.get, cache_key)
+                
+                if analysis_result is not None:
+                    self.logger.info("⚡ STEP 2: Using precomputed analysis for %s", sender_email)
+                else:
+                    analysis_result = await self._run_blocking(run_email_analyzer, email_data)
+                    if analysis_result.get("success", False):
+                        await self._run_blocking(analyzer_cache.put, cache_key, analysis_result)
+                
+                hot_lead_detected = analysis_result.get("hot_lead_detected", False)
+                meeting_request_detected = analysis_result.get("meeting_request_detected", False)
+                needs_meeting = self._needs_meeting(analysis_result)
+                
+                if availability_task is not None and needs_meeting:
+                    # shield: a cancelled flow must not cancel a prefetch other emails share
+                    try:
+                        availability_result = await asyncio.shield(availability_task)
+                    except Exception as e:
+                        self.logger.warning("Availability prefetch failed, fetching during scheduling: %s", e)
+            finally:
+                # A prefetch this flow started is cancelled if unused or abandoned (including
+                # when the analysis raised), and its outcome retrieved so no error goes unreported
+                if owned_task is not None:
+                    owned_task.cancel()
+                    owned_task.add_done_callback(_discard_task_result)
             
             if not analysis_result.get("success", False):
                 return {
@@ -221,47 +470,47 @@ class LeadManagerAgent:
                     "workflow_steps_completed": ["email_checker"]
                 }
             
-            hot_lead_detected = analysis_result.get("hot_lead_detected", False)
-            meeting_request_detected = analysis_result.get("meeting_request_detected", False)
-            
             # === STEP 3: Decision Point - Hot Lead? ===
             if hot_lead_detected:
-                self.logger.info(f"🔥 STEP 3: HOT LEAD DETECTED! ✅ → UI Notification sent")
+                self.logger.info("🔥 STEP 3: HOT LEAD DETECTED! ✅ → UI Notification sent")
             else:
-                self.logger.info(f"📧 STEP 3: No hot lead detected - CONTINUING...")
+                self.logger.info("📧 STEP 3: No hot lead detected - CONTINUING...")
             
             # === STEP 4: Meeting Request Analysis ✅ (Already completed in analyzer) ===
-            self.logger.info(f"🤖 STEP 4: Meeting Request Analysis ✅ COMPLETED")
+            self.logger.info("🤖 STEP 4: Meeting Request Analysis ✅ COMPLETED")
             
             # === STEP 5: Decision Point - Meeting Request + Hot Lead? ===
             meeting_result = {"meeting_scheduled": False, "reason": "No meeting request or not hot lead"}
             
-            if meeting_request_detected and hot_lead_detected:
-                self.logger.info(f"🚀 STEP 5: Meeting Request + Hot Lead → CALENDAR ORGANIZER")
+            if needs_meeting:
+                self.logger.info("🚀 STEP 5: Meeting Request + Hot Lead → CALENDAR ORGANIZER")
                 
                 # === STEP 6: Calendar Organizer Agent (ONLY if both hot lead + meeting request) ===
-                self.logger.info(f"📅 STEP 6: Calendar Organizer Agent → SCHEDULING...")
-                meeting_result = run_calendar_organizer(email_data, analysis_result.get("result", {}))
+                self.logger.info("📅 STEP 6: Calendar Organizer Agent → SCHEDULING...")
+                meeting_result = await self._run_blocking(
+                    run_calendar_organizer, email_data, analysis_result.get("result", {}), availability_result
+                )
                 
                 if meeting_result.get("success", False) and meeting_result.get("meeting_scheduled"):
-                    self.logger.info(f"✅ STEP 6: Meeting scheduled successfully!")
+                    self.logger.info("✅ STEP 6: Meeting scheduled successfully!")
                     workflow_steps = ["email_checker", "email_analyzer", "hot_lead_notification", "calendar_organizer"]
                 else:
-                    self.logger.error(f"❌ STEP 6: Meeting scheduling failed!")
+                    self.logger.error("❌ STEP 6: Meeting scheduling failed!")
                     workflow_steps = ["email_checker", "email_analyzer", "hot_lead_notification", "calendar_organizer_failed"]
             else:
                 if meeting_request_detected and not hot_lead_detected:
-                    self.logger.info(f"📧 STEP 5: Meeting request but NOT hot lead → NO CALENDAR ORGANIZER")
+                    self.logger.info("📧 STEP 5: Meeting request but NOT hot lead → NO CALENDAR ORGANIZER")
                     workflow_steps = ["email_checker", "email_analyzer", "calendar_organizer_skipped"]
                 else:
-                    self.logger.info(f"📧 STEP 5: No meeting request → NO CALENDAR ORGANIZER")
+                    self.logger.info("📧 STEP 5: No meeting request → NO CALENDAR ORGANIZER")
                     workflow_steps = ["email_checker", "email_analyzer"]
             
             # === STEP 7: Post Action Agent (ALWAYS RUNS LAST) ===
-            self.logger.info(f"🔧 STEP 7: Post Action Agent → FINALIZING...")
-            finalization_result = run_post_action(email_data, analysis_result, meeting_result)
+            # Side effects (save meeting, mark read) are batched across emails by aprocess_leads
+            self.logger.info("🔧 STEP 7: Post Action Agent → QUEUED for batch finalization")
+            post_action_record = build_post_action_record(email_data, analysis_result, meeting_result)
             
-            self.logger.info(f"✅ SEQUENTIAL WORKFLOW COMPLETED for: {sender_email}")
+            self.logger.info("✅ SEQUENTIAL WORKFLOW COMPLETED for: %s", sender_email)
             
             return {
                 "sender_email": sender_email,
@@ -271,13 +520,12 @@ class LeadManagerAgent:
                 "meeting_scheduled": meeting_result.get("meeting_scheduled", False),
                 "analysis_result": analysis_result,
                 "meeting_result": meeting_result,
-                "finalization_result": finalization_result,
-                "workflow_completed": finalization_result.get("success", False),
+                "post_action_record": post_action_record,
                 "workflow_steps_completed": workflow_steps
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Error processing email from {sender_email}: {str(e)}")
+            self.logger.error("❌ Error processing email from %s: %s", sender_email, e)
             return {
                 "sender_email": sender_email,
                 "processed_successful": False,
@@ -288,78 +536,12 @@ class LeadManagerAgent:
                 "workflow_steps_completed": ["email_checker", "error"]
             }
 
-    def _process_single_email(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Process a single email through the complete Lead Manager workflow.
-        
-        Args:
-            email_data: Dictionary containing email information
-            
-        Returns:
-            Processing results for the email
-        """
-        try:
-            sender_email = email_data.get("sender_email", "")
-            self.logger.info(f"Analyzing email from: {sender_email}")
-            
-            # Step 2: Email Analyzer Agent - Analyze for hot leads and meeting requests
-            analysis_result = run_email_analyzer(email_data)
-            
-            if not analysis_result.get("success", False):
-                return {
-                    "sender_email": sender_email,
-                    "processed_successful": False,
-                    "error": analysis_result.get("error", "Analysis failed"),
-                    "hot_lead_detected": False,
-                    "meeting_request_detected": False,
-                    "meeting_scheduled": False
-                }
-            
-            hot_lead_detected = analysis_result.get("hot_lead_detected", False)
-            meeting_request_detected = analysis_result.get("meeting_request_detected", False)
-            
-            self.logger.info(f"Analysis results: Hot lead({hot_lead_detected}), Meeting request({meeting_request_detected})")
-            
-            # Step 3: Calendar Organizer Agent - Schedule meeting if both hot lead AND meeting request
-            meeting_result = None
-            should_schedule = self._should_schedule_meeting(hot_lead_detected, meeting_request_detected)
-            
-            if should_schedule:
-                self.logger.info(f"Scheduling meeting for hot lead: {email_data.get('sender_email', 'Unknown')}")
-                meeting_result = run_calendar_organizer(email_data, analysis_result.get("result", {}))
-                
-                if not meeting_result.get("success", False):
-                    self.logger.error(f"Failed to schedule meeting: {meeting_result.get('error', 'Unknown error')}")
-            else:
-                self.logger.info(f"No meeting scheduled - Hot lead: {hot_lead_detected}, Meeting request: {meeting_request_detected}")
-                meeting_result = {"meeting_scheduled": False, "reason": "Conditions not met"}
-            
-            # Step 4: Post Action Agent - Finalize workflow
-            self.logger.info(f"Finalizing workflow for: {email_data.get('sender_email', 'Unknown')}")
-            finalization_result = run_post_action(email_data, analysis_result, meeting_result)
-            
-            return {
-                "sender_email": sender_email,
-                "processed_successful": True,
-                "hot_lead_detected": hot_lead_detected,
-                "meeting_request_detected": meeting_request_detected,
-                "meeting_scheduled": meeting_result.get("meeting_scheduled", False),
-                "analysis_result": analysis_result,
-                "meeting_result": meeting_result,
-                "finalization_result": finalization_result,
-                "workflow_completed": finalization_result.get("success", False)
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error processing email from {sender_email}: {str(e)}")
-            return {
-                "sender_email": sender_email,
-                "processed_successful": False,
-                "error": str(e),
-                "hot_lead_detected": False,
-                "meeting_request_detected": False,
-                "meeting_scheduled": False
-            }
+    def _needs_meeting(self, analysis_result: Dict[str, Any]) -> bool:
+        """Whether a successful analysis calls for the calendar organizer."""
+        return analysis_result.get("success", False) and self._should_schedule_meeting(
+            analysis_result.get("hot_lead_detected", False),
+            analysis_result.get("meeting_request_detected", False)
+        )
     
     def _should_schedule_meeting(self, hot_lead: bool, meeting_request: bool) -> bool:
         """Determine if a meeting should be scheduled based on analysis results."""
@@ -374,10 +556,12 @@ class LeadManagerAgent:
             "results": {
                 "workflow_started": True,
                 "emails_processed": 0,
+                "emails_filtered": 0,
                 "hot_leads_found": 0,
                 "meetings_scheduled": 0,
                 "successful_processes": 0,
                 "detailed_results": [],
+                "results_by_message_id": {},
                 "workflow_summary": {
                     "status": "No emails to process",
                     "total_emails": 0,
@@ -389,33 +573,21 @@ class LeadManagerAgent:
     
     def _generate_workflow_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate comprehensive workflow summary."""
-        try:
-            total_emails = results.get("emails_processed", 0)
-            hot_leads = results.get("hot_leads_found", 0)
-            meetings_scheduled = results.get("meetings_scheduled", 0)
-            successful_processes = results.get("successful_processes", 0)
-            
-            success_rate = (successful_processes / total_emails * 100) if total_emails > 0 else 0
-            hot_lead_rate = (hot_leads / total_emails * 100) if total_emails > 0 else 0
-            meeting_conversion_rate = (meetings_scheduled / hot_leads * 100) if hot_leads > 0 else 0
-            
-            summary = {
-                "workflow_status": "completed",
-                "total_emails_processed": total_emails,
-                "hot_leads_identified": hot_leads,
-                "meetings_successfully_scheduled": meetings_scheduled,
-                "successful_processes": successful_processes,
-                "success_rate_percentage": round(success_rate, 2),
-                "hot_lead_detection_rate": round(hot_lead_rate, 2),
-                "meeting_conversion_rate": round(meeting_conversion_rate, 2),
-                "recommendation": self._get_workflow_recommendation(results)
-            }
-            
-            return summary
-            
-        except Exception as e:
-            self.logger.error(f"Error generating workflow summary: {str(e)}")
-            return {"error": str(e)}
+        total_emails, hot_leads, meetings_scheduled, successful_processes = (
+            results.get(key, 0) for key in _SUMMARY_COUNT_KEYS
+        )
+        
+        return {
+            "workflow_status": "completed",
+            "total_emails_processed": total_emails,
+            "hot_leads_identified": hot_leads,
+            "meetings_successfully_scheduled": meetings_scheduled,
+            "successful_processes": successful_processes,
+            "success_rate_percentage": _pct(successful_processes, total_emails),
+            "hot_lead_detection_rate": _pct(hot_leads, total_emails),
+            "meeting_conversion_rate": _pct(meetings_scheduled, hot_leads),
+            "recommendation": self._get_workflow_recommendation(results)
+        }
     
     def _get_workflow_recommendation(self, results: Dict[str, Any]) -> str:
         """Get recommendation based on workflow results."""
@@ -441,7 +613,13 @@ def _create_error_result(message: str, error_details: str) -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1)
+def get_lead_manager_agent() -> LeadManagerAgent:
+    """Return the process-wide LeadManagerAgent so repeated workflow runs reuse it."""
+    return LeadManagerAgent()
+
+
 def process_leads() -> Dict[str, Any]:
     """Main entry point for Lead Manager workflow."""
-    agent = LeadManagerAgent()
+    agent = get_lead_manager_agent()
     return agent.process_leads()
\ No newline at end of file
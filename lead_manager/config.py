@@ -3,6 +3,8 @@ Configuration for Lead Manager Agent.
 """
 
 import os
+import re
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -20,6 +22,8 @@ class LeadManagerConfig:
     # Gmail Configuration
     GMAIL_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE")
     SALES_EMAIL = os.getenv("SALES_EMAIL", "sales@zemzen.org")
+    # Actually remove the UNREAD label after processing (needs the gmail.modify scope)
+    GMAIL_MARK_READ_ENABLED = os.getenv("GMAIL_MARK_READ_ENABLED", "False").lower() == "true"
     
     # Google Calendar Configuration
     CALENDAR_ID = os.getenv("CALENDAR_ID", "primary")
@@ -27,14 +31,41 @@ class LeadManagerConfig:
     BUSINESS_HOURS_END = int(os.getenv("BUSINESS_HOURS_END", "18"))
     MEETING_DURATION = int(os.getenv("MEETING_DURATION", "60"))
     AVAILABILITY_DAYS = int(os.getenv("AVAILABILITY_DAYS", "7"))
+    AVAILABILITY_CACHE_TTL_SECONDS = int(os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "60"))
+    
+    # Workflow Concurrency (bounded to respect LLM / Gmail rate limits)
+    MAX_CONCURRENT_EMAILS = int(os.getenv("MAX_CONCURRENT_EMAILS", "5"))
+    MAX_WORKERS = int(os.getenv("LEAD_MANAGER_MAX_WORKERS", "8"))
+    ANALYZER_BATCH_SIZE = int(os.getenv("ANALYZER_BATCH_SIZE", "10"))
+    MAX_UNREAD_EMAILS = int(os.getenv("MAX_UNREAD_EMAILS", "10"))
+    # Emails analyzed at once when they go through per-email LLM calls (two calls each)
+    ANALYZER_MAX_CONCURRENCY = int(os.getenv("ANALYZER_MAX_CONCURRENCY", "10"))
+    
+    # Email Analyzer Cache (skips repeat LLM calls for already-analyzed emails)
+    ANALYZER_CACHE_SIZE = int(os.getenv("ANALYZER_CACHE_SIZE", "1024"))
+    ANALYZER_CACHE_TTL_SECONDS = int(os.getenv("ANALYZER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    
+    # Verdict cache: exact repeats from the same sender domain reuse the cached verdict.
+    # Near-duplicate reuse is opt-in, since word-overlap similarity cannot tell
+    # "very interested" from "not interested" in an otherwise identical email
+    SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+    SEMANTIC_CACHE_NEAR_DUPLICATES = os.getenv("SEMANTIC_CACHE_NEAR_DUPLICATES", "False").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
     
     # Cerebras LLM Configuration
     CEREBRAS_API_KEY = os.getenv("CEREBRAS_API_KEY")
     CEREBRAS_BASE_URL = os.getenv("CEREBRAS_BASE_URL")
     DEFAULT_MODEL = "cerebras/llama3.1-8b"
+    # Model for the hot lead / meeting request classifiers; point at a smaller or
+    # lower-precision deployment to cut per-email latency
+    ANALYSIS_MODEL = os.getenv("LEAD_MANAGER_ANALYSIS_MODEL", DEFAULT_MODEL)
+    
+    # JSON file mapping sender domains to known company context for hot lead analysis
+    DOMAIN_CONTEXT_FILE = os.getenv("LEAD_MANAGER_DOMAIN_CONTEXT_FILE")
     
     # UI Notifications
     UI_CLIENT_SERVICE_URL = os.getenv("UI_CLIENT_SERVICE_URL", "http://localhost:8000")
+    UI_NOTIFICATIONS_ENABLED = os.getenv("UI_NOTIFICATIONS_ENABLED", "False").lower() == "true"
     
     # Hot Lead Detection Configuration (Content-based)
     HOT_LEAD_KEYWORDS = [
@@ -50,6 +81,30 @@ class LeadManagerConfig:
         "priority", "important", "deadline", "timeline", "schedule"
     ]
     
+    # Word stems that must appear in the subject or body before the analyzer LLM is called
+    LEAD_SIGNAL_STEMS = (
+        "interest", "pric", "quot", "demo", "propos", "partner", "collaborat",
+        "consult", "implement", "schedul", "meet", "call", "availab"
+    )
+    LLM_PREFILTER_ENABLED = os.getenv("LLM_PREFILTER_ENABLED", "True").lower() == "true"
+    
+    # Scheduling word stems; without one, the meeting LLM call is skipped for low-confidence leads
+    MEETING_SIGNAL_STEMS = ("meet", "schedul", "calendar", "call", "zoom", "demo", "availab", "book")
+    MEETING_GATE_CONFIDENCE = float(os.getenv("MEETING_GATE_CONFIDENCE", "0.3"))
+    
+    # Non-business email filters (sender local parts and subject phrases)
+    SKIP_SENDER_LOCAL_PARTS = frozenset([
+        "noreply", "no-reply", "notification", "admin", "support", "bounce",
+        "mail-noreply", "news", "marketing", "updates"
+    ])
+    
+    SKIP_SUBJECT_KEYWORDS = (
+        "verify your account", "account verification",
+        "payment required", "billing notification", "system maintenance",
+        "security alert", "password reset", "two-factor authentication",
+        "spam warning", "virus detected"
+    )
+    
     # Email Analysis Configuration
     MIN_CONFIDENCE_SCORE = 0.7
     HOT_LEAD_THRESHOLD = 0.6
@@ -70,4 +125,49 @@ class LeadManagerConfig:
             print(f"Missing required environment variables: {', '.join(missing_vars)}")
             return False
         
-        return True
\ No newline at end of file
+        return True
+
+
+
+@lru_cache(maxsize=1)
+def get_config() -> LeadManagerConfig:
+    """Return the process-wide LeadManagerConfig; env vars are resolved once at import."""
+    return LeadManagerConfig()
+
+
+# Suffix tuple keeps the old "noreply@" substring semantics (e.g. "cloudplatform-noreply@")
+SKIP_SENDER_SUFFIXES = tuple(LeadManagerConfig.SKIP_SENDER_LOCAL_PARTS)
+
+# Single-pass matcher for non-business subject phrases (subject is lowercased by callers)
+SKIP_SUBJECT_PATTERN = re.compile("|".join(map(re.escape, LeadManagerConfig.SKIP_SUBJECT_KEYWORDS)))
+
+# Precompiled whole-word matchers; analyzers should use these instead of looping over the lists
+HOT_LEAD_PATTERN = re.compile(
+    r"\b(" + "|".join(map(re.escape, LeadManagerConfig.HOT_LEAD_KEYWORDS)) + r")\b", re.IGNORECASE
+)
+HOT_LEAD_URGENCY_PATTERN = re.compile(
+    r"\b(" + "|".join(map(re.escape, LeadManagerConfig.HOT_LEAD_URGENCY_KEYWORDS)) + r")\b", re.IGNORECASE
+)
+
+# Word-start matcher for LEAD_SIGNAL_STEMS ("pric" matches "price" and "pricing")
+LEAD_SIGNAL_PATTERN = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, LeadManagerConfig.LEAD_SIGNAL_STEMS)) + r")", re.IGNORECASE
+)
+
+# Word-start matcher for MEETING_SIGNAL_STEMS ("schedul" matches "schedule" and "scheduling")
+MEETING_SIGNAL_PATTERN = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, LeadManagerConfig.MEETING_SIGNAL_STEMS)) + r")", re.IGNORECASE
+)
+
+# Sender local parts that are safe to exclude server-side. Gmail's from: also matches
+# words in the display name, so "support", "marketing", "news" etc. would drop real
+# leads such as "Acme Support Team"; those stay with _should_process_email
+GMAIL_QUERY_SKIP_LOCAL_PARTS = ("noreply", "no-reply", "mail-noreply", "bounce")
+
+# Gmail search query that excludes the unambiguous part of the skip list server-side, so
+# those emails are never downloaded; _should_process_email applies the full filter
+GMAIL_UNREAD_QUERY = " ".join(
+    ["is:unread"]
+    + [f"-from:{local_part}@" for local_part in GMAIL_QUERY_SKIP_LOCAL_PARTS]
+    + [f'-subject:"{keyword}"' for keyword in LeadManagerConfig.SKIP_SUBJECT_KEYWORDS]
+)
@@ -0,0 +1,185 @@
+"""
+UI notification delivery for Lead Manager agents.
+All notifications share one pooled keep-alive HTTP session.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from lead_manager.config import LeadManagerConfig
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+UI_NOTIFICATIONS_URL = f"{LeadManagerConfig.UI_CLIENT_SERVICE_URL}/notifications"
+# (connect, read) seconds: fail fast when the UI service is down, allow it time to respond otherwise
+NOTIFICATION_TIMEOUT_SECONDS = (1.0, 3.0)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# One session for every notification so bursts reuse pooled connections
+# instead of paying a TCP/TLS handshake per POST
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.1))
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+
+def _json_default(value: Any) -> str:
+    """Match orjson's OPT_NAIVE_UTC | OPT_UTC_Z datetime output in the stdlib fallback."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.isoformat() + "Z"
+        return value.isoformat().replace("+00:00", "Z")
+    return str(value)
+
+
+def dumps_notification(notification_data: Dict[str, Any]) -> bytes:
+    """
+    Serialize a notification to JSON bytes (orjson fast path when installed).
+    
+    Naive datetimes are treated as UTC, so callers can pass datetime objects
+    instead of formatting timestamps themselves.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(notification_data, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+    return json.dumps(notification_data, default=_json_default).encode("utf-8")
+
+
+def post_ui_notification(notification_data: Dict[str, Any]) -> bool:
+    """
+    POST a notification to the UI client service.
+    
+    Returns False without sending when UI_NOTIFICATIONS_ENABLED is off.
+    """
+    if not LeadManagerConfig.UI_NOTIFICATIONS_ENABLED:
+        return False
+    
+    try:
+        response = _SESSION.post(
+            UI_NOTIFICATIONS_URL,
+            data=dumps_notification(notification_data),
+            headers=_JSON_HEADERS,
+            timeout=NOTIFICATION_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        return True
+    except requests.RequestException as e:
+        logger.error(f"Error posting UI notification: {str(e)}")
+        return False
+
+
+class NotificationBus:
+    """
+    Coalesces UI notifications and delivers them off the workflow's critical path.
+    
+    Notifications go onto an asyncio.Queue owned by a dedicated event-loop thread,
+    so both sync and async callers can enqueue. The loop flushes a batch once
+    BATCH_SIZE notifications are waiting or FLUSH_INTERVAL_SECONDS has passed,
+    posting the whole batch concurrently over the pooled session.
+    """
+    
+    BATCH_SIZE = 16
+    FLUSH_INTERVAL_SECONDS = 0.2
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def enqueue(self, notification_data: Dict[str, Any]) -> None:
+        """Queue a notification for delivery; a no-op when UI notifications are disabled."""
+        if not LeadManagerConfig.UI_NOTIFICATIONS_ENABLED:
+            return
+        loop = self._ensure_started()
+        loop.call_soon_threadsafe(self._queue.put_nowait, notification_data)
+    
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every queued notification has been posted (or timeout expires)."""
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            future.cancel()
+            logger.warning(f"Notification flush did not complete: {str(e)}")
+    
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the event-loop thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                threading.Thread(
+                    target=self._run_loop,
+                    args=(loop, ready),
+                    name="notification-bus",
+                    daemon=True
+                ).start()
+                ready.wait()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.BATCH_SIZE,
+                    thread_name_prefix="notification-post"
+                )
+                self._loop = loop
+                atexit.register(self.flush)
+        return self._loop
+    
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        self._queue = asyncio.Queue()
+        loop.create_task(self._drain())
+        loop.call_soon(ready.set)
+        loop.run_forever()
+    
+    async def _drain(self) -> None:
+        """Collect notifications into batches and post each batch concurrently."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.FLUSH_INTERVAL_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self._post_batch(loop, batch)
+            for _ in batch:
+                self._queue.task_done()
+    
+    async def _post_batch(self, loop: asyncio.AbstractEventLoop, batch: List[Dict[str, Any]]) -> None:
+        try:
+            posts = [loop.run_in_executor(self._executor, post_ui_notification, n) for n in batch]
+        except RuntimeError:
+            # Executors refuse new work once interpreter shutdown begins (before atexit
+            # flush runs), so deliver what is left from the loop thread itself
+            results = [post_ui_notification(n) for n in batch]
+        else:
+            results = await asyncio.gather(*posts, return_exceptions=True)
+        failed = sum(1 for r in results if r is not True)
+        if failed:
+            logger.warning(f"{failed} of {len(batch)} UI notifications were not delivered")
+
+
+# Process-wide bus shared by every agent
+notification_bus = NotificationBus()
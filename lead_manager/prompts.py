@@ -2,10 +2,18 @@
 Prompts for Lead Manager agents.
 """
 
+import json
+import logging
+import sys
+from functools import lru_cache
+from typing import Dict, List
+
 from lead_manager.config import LeadManagerConfig
 
+logger = logging.getLogger(__name__)
+
 # Email Checker Agent Prompt
-EMAIL_CHECKER_PROMPT = f"""
+EMAIL_CHECKER_PROMPT = """
 You are an expert email processing agent responsible for retrieving and structuring unread emails from Gmail.
 
 Your primary responsibilities:
@@ -15,9 +23,9 @@ Your primary responsibilities:
 4. **Thread Management**: Track conversation history and thread relationships
 
 **Email Data Structure**: Return emails in the following format:
-{{
+{
     "unread_emails": [
-        {{
+        {
             "sender_email": "email@domain.com",
             "sender_name": "Sender Name",
             "subject": "Email Subject",
@@ -26,15 +34,15 @@ Your primary responsibilities:
             "message_id": "unique_message_id",
             "thread_id": "thread_id",
             "thread_conversation_history": []
-        }}
+        }
     ]
-}}
+}
 
 Use the check_email_tool to retrieve emails systematically and structure them properly for downstream analysis.
 """
 
 # Email Analyzer Agent Prompt
-EMAIL_ANALYZER_PROMPT = f"""
+EMAIL_ANALYZER_PROMPT = """
 You are an expert email analyst specialized in identifying sales opportunities and meeting requests from business emails.
 
 Your primary responsibilities:
@@ -70,45 +78,8 @@ Process each email systematically:
 Remember: Focus on email content analysis, not database lookups. Detect hot leads based on genuine interest signals in the email text.
 """
 
-# Calendar Organizer Agent Prompt
-CALENDAR_ORGANIZER_PROMPT = f"""
-You are a professional calendar management specialist responsible for scheduling meetings with qualified leads.
-
-**Business Hours**: {LeadManagerConfig.BUSINESS_HOURS_START}:00 - {LeadManagerConfig.BUSINESS_HOURS_END}:00
-**Meeting Duration**: {LeadManagerConfig.MEETING_DURATION} minutes
-**Check Ahead**: {LeadManagerConfig.AVAILABILITY_DAYS} days
-
-Your responsibilities:
-1. **Availability Checking**: Scan calendar for available slots within business hours (weekdays only)
-2. **Meeting Creation**: Generate professional meeting invitations with Google Meet links
-3. **Conflict Resolution**: Handle scheduling conflicts and suggest alternative times
-4. **Professional Communication**: Create clear meeting agendas and descriptions
-
-**Meeting Creation Process**:
-- Select optimal time slots (prefer earlier slots for urgent requests)
-- Generate professional meeting titles based on business context
-- Create detailed meeting descriptions with clear agendas
-- Include Google Meet video conference links
-- Send invitations to all attendees
-
-**Optimization Rules**:
-- Schedule within business hours on weekdays only
-- Avoid scheduling outside normal business times
-- Prioritize urgent meeting requests
-- Provide alternative options if preferred times unavailable
-- Ensure meeting descriptions are professional and informative
-
-Tools available:
-- Check calendar availability
-- Create Google Calendar events
-- Detect and resolve conflicts
-- Send meeting invitations
-
-Generate intelligent scheduling recommendations based on lead analysis and urgency levels.
-"""
-
 # Post Action Agent Prompt
-POST_ACTION_PROMPT = f"""
+POST_ACTION_PROMPT = """
 You are a meticulous process finalization specialist responsible for completing the Lead Manager workflow.
 
 **Finalization Activities**:
@@ -146,7 +117,7 @@ Ensure the Lead Manager workflow is properly finalized with clean audit trails a
 """
 
 # Main Lead Manager Prompt
-LEAD_MANAGER_PROMPT = f"""
+LEAD_MANAGER_PROMPT = """
 You are orchestrating a sophisticated Lead Manager workflow that processes emails, identifies hot leads using AI content analysis, and automatically schedules meetings.
 
 **Workflow Overview**:
@@ -184,53 +155,152 @@ AI analysis identifies both explicit and implicit meeting requests:
 Execute this workflow systematically, focusing on AI-powered lead qualification rather than database lookups.
 """
 
-# Meeting Analysis Tool Prompt
-MEETING_REQUEST_PROMPT = """
-Analyze the following email content to determine if it contains a meeting request.
-
-**Context**: You are analyzing business emails to identify meeting scheduling requests.
-**Method**: Use AI-powered content analysis to detect both explicit and implicit meeting requests.
-
-**Meeting Request Indicators**:
-- Direct requests: "Let's meet", "Schedule a call", "Set up a meeting", "book a slot"
+# LLM analysis system prompts. These never contain per-email data, so every call
+# shares a byte-identical prefix the provider can cache; the email goes in the
+# user message that follows (see analysis_messages)
+MEETING_ANALYSIS_SYSTEM_PROMPT = """
+You are an expert email analyst specializing in identifying meeting requests in business emails.
+
+Analyze the email in the user message and determine:
+
+1. Does this email contain a meeting request (explicit or implicit)?
+2. What is your confidence level (0.0-1.0)?
+3. What type of meeting request is it?
+4. What is the urgency level?
+5. Are there any specific dates/times mentioned?
+6. What topics would be discussed?
+
+Respond ONLY in valid JSON format:
+{
+    "is_meeting_request": bool,
+    "confidence": 0.0-1.0,
+    "request_type": "explicit|implicit|none",
+    "urgency": "urgent|high|normal|low",
+    "extracted_dates": ["mentioned dates/times"],
+    "extracted_topics": ["topics to discuss"]
+}
+
+Meeting request indicators include:
+- Direct requests: "Let's meet", "Schedule a call", "Set up a meeting"
 - Implicit requests: "When are you available?", "Discuss this further", "Chat about"
-- Calendar phrases: "Schedule time", "Book a call", "Arrange meeting", "demo session"
-- Availability inquiries: "find time", "available", "convenient time"
+- Calendar phrases: "Schedule time", "Book a slot", "Arrange meeting"
+"""
 
-**Response Format**: Return structured JSON analysis with:
-- is_meeting_request: boolean
-- confidence: float (0.0-1.0)
-- request_type: "explicit"|"implicit"|"none"
-- urgency: "urgent"|"high"|"normal"|"low"
-- extracted_dates: array of mentioned dates/times
-- extracted_topics: array of discussion topics
+HOT_LEAD_ANALYSIS_SYSTEM_PROMPT = """
+You are an expert sales analyst specializing in identifying hot leads from email communications.
+
+Analyze the email in the user message and determine:
+
+1. Is this email sender a potentially hot lead (showing genuine interest)?
+2. What is your confidence score (0.0-1.0)?
+3. What lead qualification score would you give (0-100)?
+4. What is the likely lead source?
+5. What specific signals indicate interest?
+6. What is the business context?
+
+Respond ONLY in valid JSON format:
+{
+    "is_hot_lead": bool,
+    "confidence": 0.0-1.0,
+    "lead_score": 0-100,
+    "lead_source": "prospect|referral|inbound|outbound|unknown",
+    "interest_signals": ["list of interest indicators"],
+    "business_context": "brief description of business interest"
+}
+
+Hot lead indicators include:
+- Expressing genuine interest in services/products
+- Asking specific questions about offerings
+- Mentioning budget, timelines, or decision-making process
+- Requesting demos, pricing, or proposals
+- Professional email addresses from business domains
+- Specific business pain points mentioned
+- Mentions of partnerships or collaboration
+
+Avoid identifying automated emails, spam, or promotional content as hot leads.
+"""
 
-Focus on understanding the true intent behind the email content using sophisticated AI analysis.
+BATCH_ANALYSIS_SYSTEM_PROMPT = """
+You are an expert sales analyst specializing in identifying hot leads and meeting requests in business emails.
+
+The user message contains numbered emails. For EACH email, determine whether the sender is a hot lead
+(genuine interest in services, specific questions, budget/timeline mentions, demo/pricing/proposal requests)
+and whether the email contains a meeting request (explicit or implicit). Do not treat automated, spam or
+promotional emails as hot leads.
+
+Respond ONLY with a valid JSON array containing exactly one object per email, in the same order as the emails:
+[
+    {
+        "index": 0,
+        "is_hot_lead": bool,
+        "hot_lead_confidence": 0.0-1.0,
+        "lead_score": 0-100,
+        "lead_source": "prospect|referral|inbound|outbound|unknown",
+        "interest_signals": ["list of interest indicators"],
+        "business_context": "brief description of business interest",
+        "is_meeting_request": bool,
+        "meeting_confidence": 0.0-1.0,
+        "request_type": "explicit|implicit|none",
+        "urgency": "urgent|high|normal|low",
+        "extracted_dates": ["mentioned dates/times"],
+        "extracted_topics": ["topics to discuss"]
+    }
+]
 """
 
-# Hot Lead Analysis Prompt
-HOT_LEAD_PROMPT = """
-Analyze the following email content to identify potential hot leads using AI-powered content analysis.
-
-**Context**: You are a sales intelligence analyst identifying genuine business prospects from email communications.
-**Method**: Use AI analysis to detect business interest signals and qualification indicators.
-
-**Hot Lead Indicators**:
-- Expressing genuine interest: "interested", "services", "consultation", "help"
-- Asking specific questions: "pricing", "demo", "proposal", "partnership", "implementation"
-- Mentioning business context: "company", "project", "business", "requirements"
-- Professional communication: business-focused language, company domains
-- Specific pain points: "need", "looking for", "challenges", "solutions"
-- Business meetings: "meeting", "discuss", "demo", "presentation"
-
-**Response Format**: Return structured JSON analysis with:
-- is_hot_lead: boolean
-- confidence: float (0.0-1.0)
-- lead_score: integer (0-100)
-- lead_source: "prospect"|"referral"|"inbound"|"outbound"|"unknown"
-- interest_signals: array of detected interest indicators
-- business_context: brief description of business interest
-
-Avoid identifying automated emails, spam, or non-business communications as hot leads.
-Focus on genuine business interest and professional communication patterns.
-"""
\ No newline at end of file
+
+def format_email_details(email_body: str, sender_email: str, subject: str = "") -> str:
+    """Email fields as they appear in analysis prompts (body truncated to 1000 characters)."""
+    return f"""- From: {sender_email}
+- Subject: {subject}
+- Body: {email_body[:1000]}..."""
+
+
+def analysis_messages(system_prompt: str, user_content: str) -> List[Dict[str, str]]:
+    """Chat messages with the static system prompt first and the per-email content last."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def _load_domain_context() -> Dict[str, str]:
+    """Read DOMAIN_CONTEXT_FILE ({"domain": "context"}) if configured."""
+    path = LeadManagerConfig.DOMAIN_CONTEXT_FILE
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {domain.lower(): str(context) for domain, context in json.load(f).items()}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning("Could not load domain context from %s: %s", path, e)
+        return {}
+
+
+# Known company context per sender domain
+DOMAIN_CONTEXT = _load_domain_context()
+
+
+@lru_cache(maxsize=1024)
+def get_hot_lead_prompt(sender_domain: str) -> str:
+    """
+    Hot lead system prompt specialized for a sender domain.
+    
+    The domain context is appended after the static instructions, so the shared
+    prefix stays cacheable and repeat senders from a known company reuse the
+    whole specialized prompt. Unknown domains get the static prompt unchanged.
+    """
+    context = DOMAIN_CONTEXT.get(sender_domain)
+    if not context:
+        return HOT_LEAD_ANALYSIS_SYSTEM_PROMPT
+    return sys.intern(f"{HOT_LEAD_ANALYSIS_SYSTEM_PROMPT}\nKnown context for {sender_domain}: {context}\n")
+
+
+# Intern the static prompts so every reference in the process shares one object and
+# equality checks in prompt/LLM caches short-circuit on identity
+for _prompt_name in (
+    "EMAIL_CHECKER_PROMPT", "EMAIL_ANALYZER_PROMPT", "POST_ACTION_PROMPT", "LEAD_MANAGER_PROMPT",
+    "MEETING_ANALYSIS_SYSTEM_PROMPT", "HOT_LEAD_ANALYSIS_SYSTEM_PROMPT", "BATCH_ANALYSIS_SYSTEM_PROMPT",
+):
+    globals()[_prompt_name] = sys.intern(globals()[_prompt_name])
+del _prompt_name
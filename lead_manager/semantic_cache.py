@@ -0,0 +1,131 @@
+"""
+Verdict cache for the Email Analyzer.
+
+Exact repeats (retries, replays, the same email in two threads) reuse the
+cached verdict through a content hash keyed by sender domain, since the hot
+lead prompt is specialized per domain.
+
+Near-duplicate reuse is opt-in (SEMANTIC_CACHE_NEAR_DUPLICATES). Each email is
+turned into a normalized bag of words and word pairs, and an email from the same
+domain whose cosine similarity to an already-analyzed one reaches
+SEMANTIC_CACHE_THRESHOLD reuses that verdict. It is off by default because the
+similarity ignores negation: a long reply changed only from "very interested"
+to "not interested" still scores above the threshold.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from lead_manager.config import LeadManagerConfig
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# (hot_lead_analysis, meeting_request_analysis)
+Verdict = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def embed(text: str) -> Dict[str, float]:
+    """Unit-length sparse vector of the words and adjacent word pairs in text."""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    
+    norm = math.sqrt(sum(count * count for count in features.values()))
+    if not norm:
+        return {}
+    return {feature: count / norm for feature, count in features.items()}
+
+
+def content_key(text: str) -> str:
+    """Stable 128-bit digest of text with case and whitespace differences normalized away."""
+    normalized = _WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def sender_domain(email_data: Dict[str, Any]) -> str:
+    """Lowercased domain of the email's sender ('' when there is none)."""
+    return email_data.get("sender_email", "").rpartition("@")[2].strip(" >").lower()
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(feature, 0.0) for feature, weight in a.items())
+
+
+class SemanticCache:
+    """Bounded LRUs of exact (domain, content hash) verdicts and, when enabled, (domain, vector) pairs."""
+    
+    def __init__(self, max_size: int = LeadManagerConfig.SEMANTIC_CACHE_SIZE,
+                 threshold: float = LeadManagerConfig.SEMANTIC_CACHE_THRESHOLD,
+                 near_duplicates: bool = LeadManagerConfig.SEMANTIC_CACHE_NEAR_DUPLICATES):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.near_duplicates = near_duplicates
+        self._entries: "OrderedDict[int, Tuple[str, Dict[str, float], Verdict]]" = OrderedDict()
+        self._exact: "OrderedDict[str, Verdict]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def email_text(email_data: Dict[str, Any]) -> str:
+        return f"{email_data.get('subject', '')}\n{email_data.get('body', '')}"
+    
+    def get(self, email_data: Dict[str, Any]) -> Optional[Verdict]:
+        """Return the verdict of an identical (or, if enabled, similar enough) email from the same domain."""
+        text = self.email_text(email_data)
+        domain = sender_domain(email_data)
+        key = f"{domain}:{content_key(text)}"
+        with self._lock:
+            verdict = self._exact.get(key)
+            if verdict is not None:
+                self._exact.move_to_end(key)
+                return verdict
+        
+        if not self.near_duplicates:
+            return None
+        vector = embed(text)
+        if not vector:
+            return None
+        
+        with self._lock:
+            best_id, best_score = None, self.threshold
+            for entry_id, (cached_domain, cached_vector, _) in self._entries.items():
+                if cached_domain != domain:
+                    continue
+                score = _cosine(vector, cached_vector)
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            
+            if best_id is None:
+                return None
+            self._entries.move_to_end(best_id)
+            return self._entries[best_id][2]
+    
+    def put(self, email_data: Dict[str, Any], verdict: Verdict) -> None:
+        """Remember an email's verdict, evicting the least recently used entry when full."""
+        text = self.email_text(email_data)
+        domain = sender_domain(email_data)
+        key = f"{domain}:{content_key(text)}"
+        vector = embed(text) if self.near_duplicates else None
+        
+        with self._lock:
+            self._exact[key] = verdict
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.max_size:
+                self._exact.popitem(last=False)
+            
+            if not vector:
+                return
+            self._entries[self._next_id] = (domain, vector, verdict)
+            self._next_id += 1
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+semantic_cache = SemanticCache()
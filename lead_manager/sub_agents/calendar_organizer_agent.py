@@ -4,11 +4,16 @@ Schedules meetings with hot leads based on calendar availability.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from crewai import Agent, Task, Crew
+import threading
+import time
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from crewai import Agent
 from leads_finder.llm_config import get_crewai_llm
-from lead_manager.prompts import CALENDAR_ORGANIZER_PROMPT
+from lead_manager.config import LeadManagerConfig
+from lead_manager.notifications import notification_bus
 from lead_manager.tools.calendar_tools import (
     CheckAvailabilityTool,
     CreateMeetingTool,
@@ -17,18 +22,69 @@ from lead_manager.tools.calendar_tools import (
 
 logger = logging.getLogger(__name__)
 
+# Availability shared across concurrent emails: days_ahead -> (fetched_at, result)
+_availability_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+_availability_lock = threading.Lock()
+
+# Shared read-only default for nested lookups, so misses do not allocate a dict each time
+_EMPTY = MappingProxyType({})
+
+# Subject keywords mapped to meeting title prefixes, checked in priority order
+_MEETING_TITLE_KEYWORDS = (
+    (("meeting", "call", "demo"), "Business Discussion"),
+    (("partnership", "collaboration"), "Partnership Discussion"),
+    (("service", "consultation"), "Services Consultation"),
+)
+
+
+def _slot_start(slot: Dict) -> int:
+    """Ordering key: slots carry an integer epoch alongside the ISO string (slots without one sort first)."""
+    return slot.get("start_epoch_ms", 0)
+
+
+# Calendar tools are stateless, so one instance of each serves every lead
+_check_availability_tool = CheckAvailabilityTool()
+_create_meeting_tool = CreateMeetingTool()
+_calendar_conflict_tool = CalendarConflictTool()
+
+
+def fetch_availability(days_ahead: int = LeadManagerConfig.AVAILABILITY_DAYS) -> Dict[str, Any]:
+    """
+    Fetch calendar availability, cached per process for AVAILABILITY_CACHE_TTL_SECONDS.
+    
+    The lock makes concurrent callers wait for a single fetch instead of each
+    hitting the calendar.
+    """
+    with _availability_lock:
+        cached = _availability_cache.get(days_ahead)
+        if cached and time.monotonic() - cached[0] < LeadManagerConfig.AVAILABILITY_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        availability_result = _check_availability_tool._run(days_ahead=days_ahead)
+        if availability_result.get("success", False):
+            _availability_cache[days_ahead] = (time.monotonic(), availability_result)
+        
+        return availability_result
+
 
 class CalendarOrganizerAgent:
     """Agent responsible for scheduling meetings with hot leads."""
     
     def __init__(self):
-        self.check_availability_tool = CheckAvailabilityTool()
-        self.create_meeting_tool = CreateMeetingTool()
-        self.calendar_conflict_tool = CalendarConflictTool()
+        self.check_availability_tool = _check_availability_tool
+        self.create_meeting_tool = _create_meeting_tool
+        self.calendar_conflict_tool = _calendar_conflict_tool
         self.logger = logging.getLogger(__name__)
+        self._agent = None
     
     def create_agent(self):
-        """Create the Calendar Organizer Agent."""
+        """Create the Calendar Organizer Agent (built once per instance and reused)."""
+        if self._agent is None:
+            self._agent = self._build_agent()
+        return self._agent
+    
+    def _build_agent(self):
+        """Build the CrewAI Agent; the LLM itself is memoized by get_crewai_llm."""
         return Agent(
             role="Calendar Organizer",
             goal="Schedule meetings with hot leads efficiently within business hours",
@@ -40,147 +96,178 @@ class CalendarOrganizerAgent:
             """,
             verbose=True,
             allow_delegation=False,
+            # Read-only tools: meetings are only ever booked by schedule_meeting
             tools=[
                 self.check_availability_tool,
-                self.create_meeting_tool,
                 self.calendar_conflict_tool
             ],
             llm=get_crewai_llm(model="cerebras/llama3.1-8b", temperature=0.2),
         )
     
-    def schedule_meeting(self, lead_data: Dict[str, Any], analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+    def schedule_meeting(self, lead_data: Dict[str, Any], analysis_result: Dict[str, Any],
+                         availability_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Schedule a meeting based on lead data and analysis results.
         
         Args:
             lead_data: Dictionary containing email and sender information
             analysis_result: Analysis results from Email Analyzer
+            availability_result: Prefetched availability (fetched here when omitted)
             
         Returns:
             Meeting scheduling results
         """
-        try:
-            sender_email = lead_data.get("sender_email", "")
-            sender_name = lead_data.get("sender_name", "")
-            subject = lead_data.get("subject", "")
-            body = lead_data.get("body", "")
-            
-            self.logger.info(f"Scheduling meeting for hot lead: {sender_email}")
-            
-            # Check calendar availability
-            availability_result = self.check_availability_tool._run(days_ahead=7)
-            
-            if not availability_result.get("success", False) or not availability_result.get("available_slots"):
-                return {
-                    "success": False,
-                    "error": "No available meeting slots found",
-                    "meeting_scheduled": False
-                }
-            
-            # Get optimal meeting time
-            optimal_slot = self._select_optimal_meeting_time(
-                availability_result["available_slots"],
-                analysis_result
-            )
-            
-            if not optimal_slot:
+        sender_email = lead_data.get("sender_email", "")
+        sender_name = lead_data.get("sender_name", "")
+        subject = lead_data.get("subject", "")
+        body = lead_data.get("body", "")
+        
+        self.logger.info("Scheduling meeting for hot lead: %s", sender_email)
+        
+        # One meeting per email: an email seen again (e.g. still unread on the next
+        # run) gets the meeting booked for it earlier instead of another one
+        booking_key = lead_data.get("message_id") or None
+        existing = self.create_meeting_tool.existing_meeting(booking_key) if booking_key else None
+        if existing is not None:
+            self.logger.info("Meeting %s already booked for this email", existing.get("meeting_id"))
+            return self._scheduled_result(existing, availability_result)
+        
+        # Check calendar availability (reuse a prefetched result when available)
+        if availability_result is None:
+            availability_result = fetch_availability()
+        
+        available_slots = availability_result.get("available_slots")
+        if not availability_result.get("success", False) or not available_slots:
+            return {
+                "success": False,
+                "error": "No available meeting slots found",
+                "meeting_scheduled": False
+            }
+        
+        # Create meeting title
+        meeting_title = self._generate_meeting_title(sender_name, subject, body)
+        
+        # Book the best conflict-free slot. The conflict check and the booking are
+        # separate steps, so a concurrent worker can take a slot in between; the
+        # tool claims slots atomically and reports slot_taken, and the next slot is tried.
+        meeting_result = None
+        for slot in self._candidate_slots(available_slots, analysis_result):
+            try:
+                start_datetime = slot["start_datetime"]
+            except KeyError:
+                self.logger.error("Selected slot has no start_datetime: %s", slot)
                 return {
                     "success": False,
-                    "error": "Could not determine optimal meeting time",
+                    "error": "Selected slot has no start time",
                     "meeting_scheduled": False
                 }
             
-            # Create meeting title
-            meeting_title = self._generate_meeting_title(sender_name, subject, body)
-            
-            # Create the meeting
+            # Create the meeting (the tool reports its own failures in the result)
             meeting_result = self.create_meeting_tool._run(
                 title=meeting_title,
                 attendee_email=sender_email,
-                start_datetime=optimal_slot["start_datetime"],
-                duration_minutes=60
+                start_datetime=start_datetime,
+                duration_minutes=LeadManagerConfig.MEETING_DURATION,
+                booking_key=booking_key
             )
-            
-            if meeting_result.get("success", False):
-                # Send UI notification about scheduled meeting
-                self._send_meeting_notification(lead_data, meeting_result)
-                
-                return {
-                    "success": True,
-                    "meeting_scheduled": True,
-                    "meeting_data": meeting_result.get("meeting_data", {}),
-                    "meeting_id": meeting_result.get("meeting_id", ""),
-                    "availability_checked": availability_result["total_slots"]
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": meeting_result.get("error", "Meeting creation failed"),
-                    "meeting_scheduled": False
-                }
-                
-        except Exception as e:
-            self.logger.error(f"Error scheduling meeting: {str(e)}")
+            if not meeting_result.get("slot_taken", False):
+                break
+        
+        if meeting_result is None or meeting_result.get("slot_taken", False):
             return {
                 "success": False,
-                "error": str(e),
+                "error": "No conflict-free meeting slot found",
                 "meeting_scheduled": False
             }
+        
+        if meeting_result.get("success", False):
+            # Send UI notification about a newly scheduled meeting
+            if not meeting_result.get("already_booked", False):
+                self._send_meeting_notification(lead_data, meeting_result)
+            
+            return self._scheduled_result(meeting_result, availability_result)
+        
+        self.logger.error("Error scheduling meeting: %s", meeting_result.get("error"))
+        return {
+            "success": False,
+            "error": meeting_result.get("error", "Meeting creation failed"),
+            "meeting_scheduled": False
+        }
+    
+    @staticmethod
+    def _scheduled_result(meeting_result: Dict[str, Any],
+                          availability_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        availability_result = availability_result or _EMPTY
+        return {
+            "success": True,
+            "meeting_scheduled": True,
+            "meeting_data": meeting_result.get("meeting_data", {}),
+            "meeting_id": meeting_result.get("meeting_id", ""),
+            "already_booked": meeting_result.get("already_booked", False),
+            "availability_checked": availability_result.get(
+                "total_slots", len(availability_result.get("available_slots") or ())
+            )
+        }
+    
+    def _candidate_slots(self, available_slots: List[Dict], analysis_result: Dict) -> Iterator[Dict]:
+        """
+        Yield conflict-free meeting slots in preference order, checked lazily.
+        
+        The preferred slot comes first when it passes the conflict check, then the
+        remaining slots in preference order. Conflicting slots are never yielded,
+        so nothing is yielded when every slot conflicts.
+        """
+        optimal_slot = self._select_optimal_meeting_time(available_slots, analysis_result)
+        if optimal_slot is None:
+            return
+        if not self._has_conflicts(optimal_slot):
+            yield optimal_slot
+        
+        urgency = (analysis_result.get("meeting_request_analysis") or _EMPTY).get("urgency", "normal")
+        for slot in sorted(available_slots, key=_slot_start, reverse=(urgency != "urgent")):
+            if slot is not optimal_slot and not self._has_conflicts(slot):
+                yield slot
+        
+        self.logger.info("No further conflict-free slot available")
+    
+    def _has_conflicts(self, slot: Dict) -> bool:
+        conflict_result = self.calendar_conflict_tool._run(
+            proposed_datetime=slot["start_datetime"],
+            duration_minutes=LeadManagerConfig.MEETING_DURATION,
+            detailed=False
+        )
+        return conflict_result.get("has_conflicts", False)
     
     def _select_optimal_meeting_time(self, available_slots: List[Dict], analysis_result: Dict) -> Optional[Dict]:
         """Select the optimal meeting time based on analysis and availability."""
-        try:
-            if not available_slots:
-                return None
-            
-            # Prefer slots for the next business days
-            urgency = analysis_result.get("meeting_request_analysis", {}).get("urgency", "normal")
-            
-            # Sort slots by date (earlier first for urgent requests, later first for normal)
-            sorted_slots = sorted(
-                available_slots, 
-                key=lambda x: datetime.fromisoformat(x["start_datetime"]),
-                reverse=(urgency != "urgent")
-            )
-            
-            # Select the first suitable slot
-            optimal_slot = sorted_slots[0]
-            
-            self.logger.info(f"Selected optimal meeting time: {optimal_slot['start_datetime']}")
-            return optimal_slot
-            
-        except Exception as e:
-            self.logger.error(f"Error selecting optimal meeting time: {str(e)}")
-            return available_slots[0] if available_slots else None
+        if not available_slots:
+            return None
+        
+        # Prefer slots for the next business days
+        urgency = (analysis_result.get("meeting_request_analysis") or _EMPTY).get("urgency", "normal")
+        
+        # Earliest slot for urgent requests, latest for normal ones
+        pick = min if urgency == "urgent" else max
+        optimal_slot = pick(available_slots, key=_slot_start)
+        
+        self.logger.info("Selected optimal meeting time: %s", optimal_slot.get("start_datetime"))
+        return optimal_slot
     
     def _generate_meeting_title(self, sender_name: str, subject: str, body: str) -> str:
         """Generate an appropriate meeting title."""
-        try:
-            # Extract company or name from sender
-            name_or_company = sender_name
-            
-            # Create title based on subject content
-            if any(keyword in subject.lower() for keyword in ["meeting", "call", "demo"]):
-                return f"Business Discussion - {name_or_company}"
-            elif any(keyword in subject.lower() for keyword in ["partnership", "collaboration"]):
-                return f"Partnership Discussion - {name_or_company}"
-            elif any(keyword in subject.lower() for keyword in ["service", "consultation"]):
-                return f"Services Consultation - {name_or_company}"
-            else:
-                return f"Sales Meeting - {name_or_company}"
-                
-        except Exception as e:
-            self.logger.warning(f"Error generating meeting title: {str(e)}")
-            return f"Sales Meeting - {sender_name}"
+        # Extract company or name from sender
+        name_or_company = sender_name
+        
+        # Create title based on subject content
+        subject_lower = (subject or "").lower()
+        for keywords, title_prefix in _MEETING_TITLE_KEYWORDS:
+            if any(keyword in subject_lower for keyword in keywords):
+                return f"{title_prefix} - {name_or_company}"
+        return f"Sales Meeting - {name_or_company}"
     
     def _send_meeting_notification(self, lead_data: Dict[str, Any], meeting_result: Dict[str, Any]) -> None:
         """Send UI notification about scheduled meeting."""
         try:
-            import requests
-            import os
-            from datetime import datetime
-            
-            ui_url = os.getenv("UI_CLIENT_SERVICE_URL", "http://localhost:8000")
             meeting_data = meeting_result.get("meeting_data", {})
             
             notification_data = {
@@ -188,7 +275,7 @@ class CalendarOrganizerAgent:
                 "business_id": f"meeting_{meeting_result.get('meeting_id', 'unknown')}",
                 "status": "meeting_scheduled",
                 "message": f"Meeting scheduled with {lead_data.get('sender_name', 'Lead')}",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc),
                 "data": {
                     "meeting_id": meeting_result.get("meeting_id", ""),
                     "title": meeting_data.get("title", ""),
@@ -196,7 +283,7 @@ class CalendarOrganizerAgent:
                     "end_datetime": meeting_data.get("end_datetime", ""),
                     "attendees": [
                         lead_data.get("sender_email", ""),
-                        os.getenv("SALES_EMAIL", "sales@zemzen.org")
+                        LeadManagerConfig.SALES_EMAIL
                     ],
                     "google_meet_link": meeting_data.get("google_meet_link", ""),
                     "description": meeting_data.get("description", ""),
@@ -205,17 +292,20 @@ class CalendarOrganizerAgent:
                 }
             }
             
-            # Send notification (for now, just log it)
-            self.logger.info(f"📅 MEETING SCHEDULED NOTIFICATION: {notification_data}")
-            
-            # In production, this would make an HTTP request:
-            # requests.post(f"{ui_url}/notifications", json=notification_data)
+            self.logger.info("📅 MEETING SCHEDULED NOTIFICATION: %s", notification_data)
+            notification_bus.enqueue(notification_data)
             
         except Exception as e:
-            self.logger.error(f"Error sending meeting notification: {str(e)}")
+            self.logger.error("Error sending meeting notification: %s", e)
+
+
+@lru_cache(maxsize=1)
+def get_calendar_organizer() -> CalendarOrganizerAgent:
+    """Return the process-wide CalendarOrganizerAgent so each lead reuses it."""
+    return CalendarOrganizerAgent()
 
 
-def run_calendar_organizer(lead_data: Dict[str, Any], analysis_result: Dict[str, Any]) -> Dict[str, Any]:
-    """Run calendar organizer agent."""
-    agent = CalendarOrganizerAgent()
-    return agent.schedule_meeting(lead_data, analysis_result)
\ No newline at end of file
+def run_calendar_organizer(lead_data: Dict[str, Any], analysis_result: Dict[str, Any],
+                           availability_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run calendar organizer agent, optionally with prefetched availability."""
+    return get_calendar_organizer().schedule_meeting(lead_data, analysis_result, availability_result)
\ No newline at end of file
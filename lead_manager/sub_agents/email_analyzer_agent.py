@@ -3,35 +3,94 @@ Email Analyzer Agent for Lead Manager.
 Analyzes emails to identify hot leads and meeting requests using AI.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
-import os
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Union
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 from crewai import Agent, Task, Crew
-from leads_finder.llm_config import get_crewai_llm
-from lead_manager.prompts import EMAIL_ANALYZER_PROMPT
+from leads_finder.llm_config import LLMConfig, get_crewai_llm
+from lead_manager.prompts import (
+    BATCH_ANALYSIS_SYSTEM_PROMPT,
+    EMAIL_ANALYZER_PROMPT,
+    analysis_messages,
+    format_email_details
+)
+from lead_manager.config import LeadManagerConfig, LEAD_SIGNAL_PATTERN, MEETING_SIGNAL_PATTERN
+from lead_manager.notifications import notification_bus
+from lead_manager.semantic_cache import semantic_cache
+from lead_manager.sub_agents.email_checker_agent import _parse_json_or_raw
 from lead_manager.tools.meeting_analysis_tool import (
     MeetingAnalysisTool, 
-    HotLeadAnalysisTool
+    HotLeadAnalysisTool,
+    MeetingRequestAnalysis,
+    HotLeadAnalysis
 )
 
 logger = logging.getLogger(__name__)
 
+BODY_PREVIEW_LENGTH = 200
+
+# Fields shared by every hot lead notification; only the per-email fields are filled in
+_HOT_LEAD_TEMPLATE = MappingProxyType({"agent_type": "lead_manager", "status": "found"})
+
+
+def _body_preview(body: Union[str, bytes, None]) -> str:
+    """First BODY_PREVIEW_LENGTH characters of body, with an ellipsis only when it was cut."""
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        # Decode only the previewed prefix, never a whole (possibly huge) HTML body
+        preview = body[:BODY_PREVIEW_LENGTH].decode("utf-8", errors="ignore")
+        return preview + "…" if len(body) > BODY_PREVIEW_LENGTH else preview
+    if len(body) <= BODY_PREVIEW_LENGTH:
+        return body
+    return body[:BODY_PREVIEW_LENGTH] + "…"
+
+
+# Analysis tools are stateless, so one instance of each serves every email
+_meeting_analysis_tool = MeetingAnalysisTool()
+_hot_lead_analysis_tool = HotLeadAnalysisTool()
+
+# (is_hot_lead, is_meeting_request) -> (overall_assessment, action_required, priority)
+_SUMMARY_TABLE = {
+    (True, True): ("high_value_hot_lead_with_meeting_request", True, "urgent"),
+    (True, False): ("hot_lead_interested", True, "high"),
+    (False, True): ("meeting_request_no_hot_lead", False, "medium"),
+    (False, False): ("normal_email", False, "low"),
+}
+
+# Runs the hot lead and meeting request LLM round-trips side by side; neither depends on the other
+_analysis_executor = ThreadPoolExecutor(
+    max_workers=max(2, 2 * LeadManagerConfig.ANALYZER_MAX_CONCURRENCY),
+    thread_name_prefix="email-analyzer"
+)
+
 
 class EmailAnalyzerAgent:
     """Agent responsible for analyzing emails for hot leads and meeting requests."""
     
     def __init__(self):
-        self.meeting_analysis_tool = MeetingAnalysisTool()
-        self.hot_lead_analysis_tool = HotLeadAnalysisTool()
+        self.meeting_analysis_tool = _meeting_analysis_tool
+        self.hot_lead_analysis_tool = _hot_lead_analysis_tool
         self.logger = logging.getLogger(__name__)
+        self._agent = None
     
     def create_agent(self):
-        """Create the Email Analyzer Agent."""
+        """Create the Email Analyzer Agent (built once per instance and reused)."""
+        if self._agent is None:
+            self._agent = self._build_agent()
+        return self._agent
+    
+    def _build_agent(self):
+        """Build the CrewAI Agent; the LLM itself is memoized by get_crewai_llm."""
         return Agent(
             role="Email Analyzer",
             goal="Analyze emails to identify hot leads and meeting requests using AI",
@@ -61,56 +120,57 @@ class EmailAnalyzerAgent:
             Analysis results with hot lead and meeting request information
         """
         try:
-            sender_email = email_data.get("sender_email", "")
-            sender_name = email_data.get("sender_name", "")
-            subject = email_data.get("subject", "")
-            body = email_data.get("body", "")
-            
-            self.logger.info(f"Analyzing email from {sender_email}: 'subject'")
-            
-            # Perform hot lead analysis
-            hot_lead_result = self.hot_lead_analysis_tool._run(
-                email_body=body,
-                sender_email=sender_email,
-                subject=subject
-            )
-            
-            # Perform meeting request analysis
-            meeting_result = self.meeting_analysis_tool._run(
-                email_body=body,
-                sender_email=sender_email,
-                subject=subject
-            )
+            self.logger.info(f"Analyzing email from {email_data.get('sender_email', '')}: 'subject'")
             
-            # Combine results
-            analysis_result = {
-                "email_info": {
-                    "sender_email": sender_email,
-                    "sender_name": sender_name,
-                    "subject": subject,
-                    "message_id": email_data.get("message_id", "")
-                },
-                "hot_lead_analysis": hot_lead_result.get("analysis", {}),
-                "meeting_request_analysis": meeting_result.get("analysis", {}),
-                "timestamp": email_data.get("date_received", ""),
-                "analysis_summary": self._generate_analysis_summary(
-                    hot_lead_result.get("analysis", {}),
-                    meeting_result.get("analysis", {})
-                )
-            }
+            cached_verdict = self._shortcut_verdict(email_data)
+            if cached_verdict is not None:
+                return self._build_analysis_response(email_data, *cached_verdict)
             
-            # Send UI notification if hot lead detected
-            if hot_lead_result.get("analysis", {}).get("is_hot_lead", False):
-                self._send_hot_lead_notification(analysis_result)
+            tool_args = self._tool_args(email_data)
+            if self._mentions_meeting(email_data):
+                # Submit hot lead analysis to the pool, run meeting analysis here, then collect both
+                hot_lead_future = _analysis_executor.submit(self.hot_lead_analysis_tool._run, **tool_args)
+                meeting_result = self.meeting_analysis_tool._run(**tool_args)
+                hot_lead_result = hot_lead_future.result()
+            else:
+                hot_lead_result = self.hot_lead_analysis_tool._run(**tool_args)
+                meeting_result = self._gated_meeting_result(hot_lead_result)
+                if meeting_result is None:
+                    meeting_result = self.meeting_analysis_tool._run(**tool_args)
             
-            self.logger.info(f"Email analysis completed for {sender_email}")
+            return self._complete_analysis(email_data, hot_lead_result, meeting_result)
             
+        except Exception as e:
+            self.logger.error(f"Error analyzing email content: {str(e)}")
             return {
-                "success": True,
-                "result": analysis_result,
-                "hot_lead_detected": hot_lead_result.get("analysis", {}).get("is_hot_lead", False),
-                "meeting_request_detected": meeting_result.get("analysis", {}).get("is_meeting_request", False)
+                "success": False,
+                "error": str(e),
+                "result": None
             }
+    
+    async def aanalyze_email_content(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async analyze_email_content: both LLM analyses are awaited together on the analyzer pool."""
+        try:
+            cached_verdict = self._shortcut_verdict(email_data)
+            if cached_verdict is not None:
+                return self._build_analysis_response(email_data, *cached_verdict)
+            
+            loop = asyncio.get_running_loop()
+            tool_args = self._tool_args(email_data)
+            run_hot_lead = partial(self.hot_lead_analysis_tool._run, **tool_args)
+            run_meeting = partial(self.meeting_analysis_tool._run, **tool_args)
+            if self._mentions_meeting(email_data):
+                hot_lead_result, meeting_result = await asyncio.gather(
+                    loop.run_in_executor(_analysis_executor, run_hot_lead),
+                    loop.run_in_executor(_analysis_executor, run_meeting)
+                )
+            else:
+                hot_lead_result = await loop.run_in_executor(_analysis_executor, run_hot_lead)
+                meeting_result = self._gated_meeting_result(hot_lead_result)
+                if meeting_result is None:
+                    meeting_result = await loop.run_in_executor(_analysis_executor, run_meeting)
+            
+            return self._complete_analysis(email_data, hot_lead_result, meeting_result)
             
         except Exception as e:
             self.logger.error(f"Error analyzing email content: {str(e)}")
@@ -120,74 +180,278 @@ class EmailAnalyzerAgent:
                 "result": None
             }
     
-    def _generate_analysis_summary(self, hot_lead_analysis: Dict, meeting_analysis: Dict) -> Dict[str, Any]:
-        """Generate summary of the analysis."""
-        is_hot_lead = hot_lead_analysis.get("is_hot_lead", False)
-        is_meeting_request = meeting_analysis.get("is_meeting_request", False)
+    @staticmethod
+    def _mentions_meeting(email_data: Dict[str, Any]) -> bool:
+        """Whether the subject or body contains any scheduling word."""
+        return bool(
+            MEETING_SIGNAL_PATTERN.search(email_data.get("subject", ""))
+            or MEETING_SIGNAL_PATTERN.search(email_data.get("body", ""))
+        )
+    
+    def _gated_meeting_result(self, hot_lead_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Meeting verdict for an email without scheduling words, or None if the LLM should decide.
+        
+        Such emails are only sent to the meeting LLM when the hot lead analysis is
+        confident enough (MEETING_GATE_CONFIDENCE) to make an implicit request plausible.
+        """
+        confidence = (hot_lead_result.get("analysis") or {}).get("confidence", 0.0)
+        if confidence >= LeadManagerConfig.MEETING_GATE_CONFIDENCE:
+            return None
         
-        summary = {
-            "overall_assessment": "normal_email",
-            "action_required": False,
-            "priority": "low"
+        self.logger.info("No scheduling words and low hot lead confidence, skipping meeting analysis")
+        return {
+            "success": True,
+            "analysis": MeetingRequestAnalysis(is_meeting_request=False, confidence=0.0).dict()
         }
+    
+    @staticmethod
+    def _tool_args(email_data: Dict[str, Any]) -> Dict[str, str]:
+        """Keyword arguments shared by the hot lead and meeting analysis tools."""
+        return {
+            "email_body": email_data.get("body", ""),
+            "sender_email": email_data.get("sender_email", ""),
+            "subject": email_data.get("subject", "")
+        }
+    
+    def _complete_analysis(self, email_data: Dict[str, Any], hot_lead_result: Dict[str, Any],
+                           meeting_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache LLM verdicts and build the analyzer response from both tool results."""
+        self.logger.info(f"Email analysis completed for {email_data.get('sender_email', '')}")
         
-        if is_hot_lead and is_meeting_request:
-            summary = {
-                "overall_assessment": "high_value_hot_lead_with_meeting_request",
-                "action_required": True,
-                "priority": "urgent"
-            }
-        elif is_hot_lead:
-            summary = {
-                "overall_assessment": "hot_lead_interested",
-                "action_required": True,
-                "priority": "high"
-            }
-        elif is_meeting_request:
-            summary = {
-                "overall_assessment": "meeting_request_no_hot_lead",
-                "action_required": False,
-                "priority": "medium"
-            }
+        # The analyses end up in the result, so a missing one becomes a fresh dict (only then)
+        hot_lead_analysis = hot_lead_result.get("analysis") or {}
+        meeting_analysis = meeting_result.get("analysis") or {}
+        
+        # Only LLM verdicts are reused; keyword fallbacks are not
+        if hot_lead_result.get("success", False) and meeting_result.get("success", False):
+            semantic_cache.put(email_data, (hot_lead_analysis, meeting_analysis))
+        
+        return self._build_analysis_response(email_data, hot_lead_analysis, meeting_analysis)
+    
+    def analyze_email_content_batch(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze several emails with a single LLM call.
+        
+        The emails are sent as numbered blocks and the LLM returns a JSON array in
+        the same order. If the call fails or the array does not line up with the
+        input, each email falls back to analyze_email_content.
+        
+        Args:
+            emails: List of email dictionaries
+            
+        Returns:
+            List of analysis results, index-aligned with emails
+        """
+        if not emails:
+            return []
+        
+        # Emails without lead signals and repeats of analyzed ones skip the LLM entirely
+        results: List[Optional[Dict[str, Any]]] = [None] * len(emails)
+        pending = []
+        for index, email_data in enumerate(emails):
+            cached_verdict = self._shortcut_verdict(email_data)
+            if cached_verdict is not None:
+                results[index] = self._build_analysis_response(email_data, *cached_verdict)
+            else:
+                pending.append(index)
+        
+        if len(pending) == 1:
+            results[pending[0]] = self.analyze_email_content(emails[pending[0]])
+        elif pending:
+            pending_results = self._analyze_uncached_batch([emails[index] for index in pending])
+            for index, result in zip(pending, pending_results):
+                results[index] = result
+        
+        return results
+    
+    def _shortcut_verdict(self, email_data: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """A verdict that needs no LLM call: the email has no lead signals, or a repeat of it was cached."""
+        if LeadManagerConfig.LLM_PREFILTER_ENABLED and not (
+            LEAD_SIGNAL_PATTERN.search(email_data.get("subject", ""))
+            or LEAD_SIGNAL_PATTERN.search(email_data.get("body", ""))
+        ):
+            self.logger.info(f"No lead signals in email from {email_data.get('sender_email', '')}, skipping LLM analysis")
+            return (
+                HotLeadAnalysis(is_hot_lead=False, confidence=0.05, business_context="no lead signals").dict(),
+                MeetingRequestAnalysis(is_meeting_request=False, confidence=0.05).dict()
+            )
+        
+        return self._cached_verdict(email_data)
+    
+    def _cached_verdict(self, email_data: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Copies of a cached verdict for the same email from the same domain, if any."""
+        cached_verdict = semantic_cache.get(email_data)
+        if cached_verdict is None:
+            return None
+        
+        self.logger.info(f"Reusing cached analysis for {email_data.get('sender_email', '')}")
+        hot_lead_analysis, meeting_analysis = cached_verdict
+        return dict(hot_lead_analysis), dict(meeting_analysis)
+    
+    def _analyze_uncached_batch(self, emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Single LLM call for emails that missed the semantic cache."""
+        try:
+            self.logger.info(f"Batch analyzing {len(emails)} emails")
+            
+            llm = LLMConfig.get_cerebras_llm(
+                model=LeadManagerConfig.ANALYSIS_MODEL,
+                temperature=0.3,
+                max_completion_tokens=300 * len(emails)
+            )
+            response = llm.call(self._build_batch_analysis_prompt(emails))
+            items = self._parse_batch_response(response, len(emails))
+            
+            results = []
+            for email_data, item in zip(emails, items):
+                hot_lead_analysis = HotLeadAnalysis(
+                    is_hot_lead=item.get("is_hot_lead", False),
+                    confidence=item.get("hot_lead_confidence", 0.0),
+                    lead_score=item.get("lead_score", 0),
+                    lead_source=item.get("lead_source", "unknown"),
+                    interest_signals=item.get("interest_signals", []),
+                    business_context=item.get("business_context", "unknown")
+                )
+                if hot_lead_analysis.confidence >= LeadManagerConfig.HOT_LEAD_THRESHOLD:
+                    hot_lead_analysis.is_hot_lead = True
+                
+                meeting_analysis = MeetingRequestAnalysis(
+                    is_meeting_request=item.get("is_meeting_request", False),
+                    confidence=item.get("meeting_confidence", 0.0),
+                    request_type=item.get("request_type", "none"),
+                    urgency=item.get("urgency", "normal"),
+                    extracted_dates=item.get("extracted_dates", []),
+                    extracted_topics=item.get("extracted_topics", [])
+                )
+                
+                verdict = (hot_lead_analysis.dict(), meeting_analysis.dict())
+                semantic_cache.put(email_data, verdict)
+                results.append(self._build_analysis_response(email_data, *verdict))
+            
+            self.logger.info(f"Batch analysis completed for {len(emails)} emails")
+            return results
+            
+        except Exception as e:
+            self.logger.warning(f"Batch analysis failed, analyzing emails individually: {str(e)}")
+            return asyncio.run(analyze_emails_batch(emails, agent=self))
+    
+    def _build_batch_analysis_prompt(self, emails: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Build messages covering hot lead and meeting analysis for every email (static instructions first)."""
+        email_blocks = "\n\n".join(
+            f"""Email {i}:
+{format_email_details(email_data.get("body", ""), email_data.get("sender_email", ""), email_data.get("subject", ""))}"""
+            for i, email_data in enumerate(emails)
+        )
+        
+        return analysis_messages(
+            BATCH_ANALYSIS_SYSTEM_PROMPT,
+            f"{email_blocks}\n\nReturn exactly {len(emails)} objects."
+        )
+    
+    def _parse_batch_response(self, response: str, expected_count: int) -> List[Dict[str, Any]]:
+        """Parse the batch JSON array, ordering by index and validating its length."""
+        json_start = response.find('[')
+        json_end = response.rfind(']') + 1
+        
+        if json_start < 0 or json_end <= json_start:
+            raise ValueError("No JSON array found in batch analysis response")
+        
+        parsed = _parse_json_or_raw(response[json_start:json_end])
+        if not parsed["success"]:
+            raise ValueError("Batch analysis response is not valid JSON")
+        items = parsed["result"]
+        
+        if not isinstance(items, list) or len(items) != expected_count:
+            raise ValueError(f"Expected {expected_count} analyses, got {len(items) if isinstance(items, list) else 0}")
+        
+        if all(isinstance(item, dict) and isinstance(item.get("index"), int) for item in items):
+            items = sorted(items, key=lambda item: item["index"])
+        
+        return items
+    
+    def _build_analysis_response(self, email_data: Dict[str, Any], hot_lead_analysis: Dict[str, Any],
+                                 meeting_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine hot lead and meeting analyses into the analyzer result, notifying on hot leads."""
+        sender_email = email_data.get("sender_email", "")
+        
+        analysis_result = {
+            "email_info": {
+                "sender_email": sender_email,
+                "sender_name": email_data.get("sender_name", ""),
+                "subject": email_data.get("subject", ""),
+                "message_id": email_data.get("message_id", "")
+            },
+            "hot_lead_analysis": hot_lead_analysis,
+            "meeting_request_analysis": meeting_analysis,
+            "timestamp": email_data.get("date_received", ""),
+            "analysis_summary": self._generate_analysis_summary(hot_lead_analysis, meeting_analysis)
+        }
+        
+        hot_lead_detected = hot_lead_analysis.get("is_hot_lead", False)
+        
+        # Send UI notification if hot lead detected
+        if hot_lead_detected:
+            self._send_hot_lead_notification(analysis_result, email_data.get("body"))
+        
+        return {
+            "success": True,
+            "result": analysis_result,
+            "hot_lead_detected": hot_lead_detected,
+            "meeting_request_detected": meeting_analysis.get("is_meeting_request", False)
+        }
+    
+    def _generate_analysis_summary(self, hot_lead_analysis: Dict, meeting_analysis: Dict) -> Dict[str, Any]:
+        """Generate summary of the analysis."""
+        assessment, action_required, priority = _SUMMARY_TABLE[(
+            bool(hot_lead_analysis.get("is_hot_lead", False)),
+            bool(meeting_analysis.get("is_meeting_request", False))
+        )]
         
         # Calculate confidence scores
         hot_lead_confidence = hot_lead_analysis.get("confidence", 0.0)
         meeting_confidence = meeting_analysis.get("confidence", 0.0)
         
-        summary["confidence_scores"] = {
-            "hot_lead_confidence": hot_lead_confidence,
-            "meeting_request_confidence": meeting_confidence,
-            "overall_confidence": (hot_lead_confidence + meeting_confidence) / 2
+        return {
+            "overall_assessment": assessment,
+            "action_required": action_required,
+            "priority": priority,
+            "confidence_scores": {
+                "hot_lead_confidence": hot_lead_confidence,
+                "meeting_request_confidence": meeting_confidence,
+                "overall_confidence": (hot_lead_confidence + meeting_confidence) / 2
+            }
         }
-        
-        return summary
     
-    def _send_hot_lead_notification(self, analysis_result: Dict[str, Any]) -> None:
+    def _send_hot_lead_notification(self, analysis_result: Dict[str, Any],
+                                    email_body: Union[str, bytes, None] = None) -> None:
         """Send UI notification for hot lead detection."""
+        # Nothing would consume the payload: no POST and the log line is filtered out
+        if not (LeadManagerConfig.UI_NOTIFICATIONS_ENABLED or self.logger.isEnabledFor(logging.INFO)):
+            return
+        
         try:
-            import requests
-            import os
-            from datetime import datetime
-            
-            ui_url = os.getenv("UI_CLIENT_SERVICE_URL", "http://localhost:8000")
-            
             email_info = analysis_result["email_info"]
             hot_lead_analysis = analysis_result["hot_lead_analysis"]
             
+            # Stable across processes (unlike hash()), so the UI can dedupe repeat senders
+            sender_digest = hashlib.blake2b(
+                email_info["sender_email"].lower().strip().encode("utf-8"), digest_size=8
+            ).hexdigest()
+            lead_id = f"hot_lead_{sender_digest}"
+            
             notification_data = {
-                "agent_type": "lead_manager",
-                "business_id": f"hot_lead_{hash(email_info['sender_email'])}",
-                "status": "found",
+                **_HOT_LEAD_TEMPLATE,
+                "business_id": lead_id,
                 "message": f"Hot lead email from {email_info['sender_email']}",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc),
                 "data": {
-                    "id": f"hot_lead_{hash(email_info['sender_email'])}",
+                    "id": lead_id,
                     "name": email_info.get("sender_name", ""),
                     "email": email_info["sender_email"],
                     "sender_email": email_info["sender_email"],
                     "sender_name": email_info["sender_name"],
                     "subject": email_info["subject"],
-                    "body_preview": analysis_result.get("email_body", "")[:200] + "...",
+                    "body_preview": _body_preview(email_body or analysis_result.get("email_body")),
                     "received_date": analysis_result["timestamp"],
                     "message_id": email_info.get("message_id", ""),
                     "lead_score": hot_lead_analysis.get("lead_score", 0),
@@ -198,17 +462,49 @@ class EmailAnalyzerAgent:
                 }
             }
             
-            # Send notification (for now, just log it)
-            self.logger.info(f"🔥 HOT LEAD NOTIFICATION: {notification_data}")
-            
-            # In production, this would make an HTTP request:
-            # requests.post(f"{ui_url}/notifications", json=notification_data)
+            self.logger.info("🔥 HOT LEAD NOTIFICATION: %s", notification_data)
+            # Delivered by the background bus so the analyzer never waits on the UI service
+            notification_bus.enqueue(notification_data)
             
         except Exception as e:
             self.logger.error(f"Error sending hot lead notification: {str(e)}")
 
 
+@lru_cache(maxsize=1)
+def get_email_analyzer() -> EmailAnalyzerAgent:
+    """Return the process-wide EmailAnalyzerAgent so each email reuses it."""
+    return EmailAnalyzerAgent()
+
+
 def run_email_analyzer(email_data: Dict[str, Any]) -> Dict[str, Any]:
     """Run email analyzer agent."""
-    agent = EmailAnalyzerAgent()
-    return agent.analyze_email_content(email_data)
\ No newline at end of file
+    return get_email_analyzer().analyze_email_content(email_data)
+
+
+def run_email_analyzer_batch(emails: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run email analyzer agent over several emails with one batched LLM call."""
+    return get_email_analyzer().analyze_email_content_batch(emails)
+
+
+async def analyze_emails_batch(emails: List[Dict[str, Any]],
+                               max_concurrency: int = LeadManagerConfig.ANALYZER_MAX_CONCURRENCY,
+                               agent: Optional[EmailAnalyzerAgent] = None) -> List[Dict[str, Any]]:
+    """
+    Analyze emails individually but concurrently, at most max_concurrency at a time.
+    
+    Returns:
+        Analysis results index-aligned with emails; an email whose analysis raised
+        gets an error result instead of failing the whole batch
+    """
+    agent = agent or get_email_analyzer()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def analyze(email_data: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await agent.aanalyze_email_content(email_data)
+    
+    results = await asyncio.gather(*(analyze(email_data) for email_data in emails), return_exceptions=True)
+    return [
+        {"success": False, "error": str(result), "result": None} if isinstance(result, Exception) else result
+        for result in results
+    ]
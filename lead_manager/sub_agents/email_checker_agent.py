@@ -1,7 +1,18 @@
-from typing import Any, Dict
+import asyncio
+import json
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict
 from crewai import Agent, Task, Crew, Process
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from lead_manager.config import LeadManagerConfig, GMAIL_UNREAD_QUERY
 from lead_manager.prompts import EMAIL_CHECKER_PROMPT
-from lead_manager.tools.check_email_tool import CheckEmailTool
+from lead_manager.tools.check_email_tool import CheckEmailTool, iter_unread_emails_from_gmail
 from config.cerebras_client import get_crewai_llm
 
 def create_email_checker_agent() -> Crew:
@@ -37,51 +48,50 @@ def create_email_checker_agent() -> Crew:
     return crew
 
 
+@lru_cache(maxsize=1)
+def _get_email_checker_crew() -> Crew:
+    """Build the email checker Crew (agent, task and LLM client) once per process."""
+    return create_email_checker_agent()
+
+
+def _parse_json_or_raw(raw: Any) -> Dict[str, Any]:
+    """Wrap a crew output, parsing it first when it is a JSON string."""
+    if not isinstance(raw, str):
+        return {"success": True, "result": raw}
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except covers both
+        parsed = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        return {"success": True, "result": parsed}
+    except json.JSONDecodeError:
+        return {"success": False, "error": "Failed to parse email data", "raw": raw}
+
+
 def run_email_checker():
     """Run email checker agent and return structured results."""
-    import json
     try:
-        crew = create_email_checker_agent()
+        crew = _get_email_checker_crew()
         result = crew.kickoff()
         
-        # Try to extract structured data from different result formats
-        if hasattr(result, 'raw'):
-            raw_result = result.raw
-            if isinstance(raw_result, str):
-                try:
-                    # Try to parse JSON from string
-                    parsed_result = json.loads(raw_result)
-                    return {"success": True, "result": parsed_result}
-                except json.JSONDecodeError:
-                    return {"success": False, "error": "Failed to parse email data", "raw": raw_result}
-            elif isinstance(raw_result, dict):
-                return {"success": True, "result": raw_result}
-            else:
-                return {"success": True, "result": raw_result}
-        
-        elif hasattr(result, 'output'):
-            output_result = result.output
-            if isinstance(output_result, str):
-                try:
-                    parsed_result = json.loads(output_result)
-                    return {"success": True, "result": parsed_result}
-                except json.JSONDecodeError:
-                    return {"success": False, "error": "Failed to parse email data", "raw": output_result}
-            elif isinstance(output_result, dict):
-                return {"success": True, "result": output_result}
-            else:
-                return {"success": True, "result": output_result}
+        # CrewOutput exposes .raw; older results use .output, then .to_dict(), then str()
+        raw = getattr(result, 'raw', None) or getattr(result, 'output', None)
+        if raw is None:
+            to_dict = getattr(result, 'to_dict', None)
+            raw = to_dict() if to_dict is not None else str(result)
         
-        elif hasattr(result, 'to_dict'):
-            return {"success": True, "result": result.to_dict()}
-            
-        # If all else fails, try to convert to string and parse
-        string_result = str(result)
-        try:
-            parsed_result = json.loads(string_result)
-            return {"success": True, "result": parsed_result}
-        except json.JSONDecodeError:
-            return {"success": False, "error": "Failed to parse email data", "raw": string_result}
+        return _parse_json_or_raw(raw)
             
     except Exception as e:
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+        return {"success": False, "error": str(e)}
+
+
+async def stream_email_checker(max_results: int = LeadManagerConfig.MAX_UNREAD_EMAILS,
+                               query: str = GMAIL_UNREAD_QUERY) -> AsyncIterator[Dict[str, Any]]:
+    """Yield unread emails as Gmail returns them, fetching each one off the event loop."""
+    emails = iter_unread_emails_from_gmail(max_results=max_results, query=query)
+    exhausted = object()
+    
+    while True:
+        email_data = await asyncio.to_thread(next, emails, exhausted)
+        if email_data is exhausted:
+            break
+        yield email_data
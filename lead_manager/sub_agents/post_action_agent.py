@@ -4,9 +4,14 @@ Finalizes the booking process and cleans up after meeting scheduling.
 """
 
 import logging
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
 from crewai import Agent, Task, Crew
 from leads_finder.llm_config import get_crewai_llm
+from lead_manager.config import LeadManagerConfig
 from lead_manager.prompts import POST_ACTION_PROMPT
 from lead_manager.tools.mongodb_lead_tools import (
     MarkEmailReadTool,
@@ -16,18 +21,42 @@ from lead_manager.tools.mongodb_lead_tools import (
 
 logger = logging.getLogger(__name__)
 
+# Post-action tools are stateless, so one instance of each serves every email
+_mark_email_read_tool = MarkEmailReadTool()
+_save_meeting_tool = SaveMeetingTool()
+_ui_notification_tool = UINotificationTool()
+
+# Shared read-only default for nested lookups, so misses do not allocate a dict each time
+_EMPTY = MappingProxyType({})
+
+# Fields shared by every completion notification; only the per-email fields are filled in
+_COMPLETION_TEMPLATE = MappingProxyType({"workflow_status": "completed", "agent_type": "lead_manager"})
+
+# The save / mark-read / notify side effects are independent I/O, so they run side by side
+_post_action_executor = ThreadPoolExecutor(
+    max_workers=max(3, LeadManagerConfig.MAX_WORKERS),
+    thread_name_prefix="post-action"
+)
+
 
 class PostActionAgent:
     """Agent responsible for finalizing the Lead Manager workflow."""
     
     def __init__(self):
-        self.mark_email_read_tool = MarkEmailReadTool()
-        self.save_meeting_tool = SaveMeetingTool()
-        self.ui_notification_tool = UINotificationTool()
+        self.mark_email_read_tool = _mark_email_read_tool
+        self.save_meeting_tool = _save_meeting_tool
+        self.ui_notification_tool = _ui_notification_tool
         self.logger = logging.getLogger(__name__)
+        self._agent = None
     
     def create_agent(self):
-        """Create the Post Action Agent."""
+        """Create the Post Action Agent (built once per instance and reused)."""
+        if self._agent is None:
+            self._agent = self._build_agent()
+        return self._agent
+    
+    def _build_agent(self):
+        """Build the CrewAI Agent; the LLM itself is memoized by get_crewai_llm."""
         return Agent(
             role="Post Action Manager",
             goal="Finalize the lead management process and ensure proper cleanup",
@@ -70,25 +99,36 @@ class PostActionAgent:
                 "notifications_sent": False
             }
             
-            # Save meeting data if meeting was scheduled
+            # Submit every side effect first, then collect the results
             meeting_scheduled = meeting_result.get("meeting_scheduled", False)
+            save_future = None
             if meeting_scheduled and meeting_result.get("meeting_data"):
-                save_result = self._save_meeting_data(email_data, analysis_result, meeting_result)
+                save_future = _post_action_executor.submit(
+                    self._save_meeting_data, email_data, analysis_result, meeting_result
+                )
+            mark_read_future = _post_action_executor.submit(self._mark_email_as_read, email_data)
+            notification_future = _post_action_executor.submit(
+                self._send_completion_notification, email_data, analysis_result, meeting_result
+            )
+            
+            # Save meeting data if meeting was scheduled
+            if save_future is not None:
+                save_result = save_future.result()
                 results["meeting_saved"] = save_result["success"]
-                results["activities_completed"].append("meeting_data_saved")
                 
                 if save_result["success"]:
+                    results["activities_completed"].append("meeting_data_saved")
                     self.logger.info("Meeting data saved successfully")
             
             # Mark email as read
-            mark_read_result = self._mark_email_as_read(email_data)
+            mark_read_result = mark_read_future.result()
             results["email_marked_read"] = mark_read_result["success"]
             if mark_read_result["success"]:
                 results["activities_completed"].append("email_marked_read")
                 self.logger.info("Email marked as read")
             
             # Send completion notification
-            notification_result = self._send_completion_notification(email_data, analysis_result, meeting_result)
+            notification_result = notification_future.result()
             results["notifications_sent"] = notification_result["success"]
             if notification_result["success"]:
                 results["activities_completed"].append("completion_notification_sent")
@@ -114,30 +154,114 @@ class PostActionAgent:
                 "notifications_sent": False
             }
     
+    def finalize_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Finalize many emails at once from build_post_action_record() records.
+        
+        Meetings are saved with one insert_many and all message IDs are marked read
+        with one call; notifications and summaries stay per email.
+        
+        Returns:
+            Finalization results, index-aligned with records
+        """
+        try:
+            self.logger.info(f"Finalizing {len(records)} emails in one batch")
+            
+            # The bulk save and the bulk mark-read are independent, so overlap them
+            meeting_documents = [record["meeting_document"] for record in records if record["meeting_document"]]
+            save_future = _post_action_executor.submit(self.save_meeting_tool.save_many, meeting_documents) if meeting_documents else None
+            
+            message_ids = [record["message_id"] for record in records if record["message_id"]]
+            mark_read_future = _post_action_executor.submit(self.mark_email_read_tool._run, message_ids) if message_ids else None
+            
+            save_result = save_future.result() if save_future else None
+            mark_read_result = mark_read_future.result() if mark_read_future else None
+            
+            # A partial bulk failure names the failed documents; any other failure loses them all
+            if save_result is None or save_result["success"]:
+                failed_meetings = set()
+            elif "failed_indices" in save_result:
+                failed_meetings = {id(meeting_documents[index]) for index in save_result["failed_indices"]}
+            else:
+                failed_meetings = {id(document) for document in meeting_documents}
+            
+            finalization_results = []
+            now = datetime.now(timezone.utc)
+            for record in records:
+                email_data = record["email_data"]
+                analysis_result = record["analysis_result"]
+                meeting_result = record["meeting_result"]
+                
+                results = {
+                    "success": True,
+                    "activities_completed": [],
+                    "meeting_saved": False,
+                    "email_marked_read": False,
+                    "notifications_sent": False
+                }
+                
+                if record["meeting_document"]:
+                    results["meeting_saved"] = id(record["meeting_document"]) not in failed_meetings
+                    if results["meeting_saved"]:
+                        results["activities_completed"].append("meeting_data_saved")
+                
+                if record["message_id"] and mark_read_result["success"]:
+                    results["email_marked_read"] = True
+                    results["activities_completed"].append("email_marked_read")
+                
+                notification_result = self._send_completion_notification(email_data, analysis_result, meeting_result, now)
+                results["notifications_sent"] = notification_result["success"]
+                if notification_result["success"]:
+                    results["activities_completed"].append("completion_notification_sent")
+                
+                results["workflow_summary"] = self._generate_workflow_summary(
+                    email_data, analysis_result, meeting_result, results
+                )
+                finalization_results.append(results)
+            
+            self.logger.info(f"Batch finalized: {len(meeting_documents) - len(failed_meetings)} meetings saved, {len(message_ids)} emails marked read")
+            
+            return finalization_results
+            
+        except Exception as e:
+            self.logger.error(f"Error finalizing workflow batch: {str(e)}")
+            return [{
+                "success": False,
+                "error": str(e),
+                "activities_completed": [],
+                "meeting_saved": False,
+                "email_marked_read": False,
+                "notifications_sent": False
+            } for _ in records]
+    
+    @staticmethod
+    def _build_meeting_document(email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the MongoDB meeting document for a scheduled meeting."""
+        hot_lead_analysis = (analysis_result.get("result") or _EMPTY).get("hot_lead_analysis") or _EMPTY
+        return {
+            "email_context": {
+                "sender_email": email_data.get("sender_email", ""),
+                "sender_name": email_data.get("sender_name", ""),
+                "subject": email_data.get("subject", ""),
+                "date_received": email_data.get("date_received", ""),
+                "message_id": email_data.get("message_id", ""),
+                "thread_id": email_data.get("thread_id", "")
+            },
+            "analysis_context": {
+                "hot_lead_detected": analysis_result.get("hot_lead_detected", False),
+                "meeting_request_detected": analysis_result.get("meeting_request_detected", False),
+                "hot_lead_score": hot_lead_analysis.get("lead_score", 0),
+                "confidence": hot_lead_analysis.get("confidence", 0.0)
+            },
+            "meeting_details": meeting_result.get("meeting_data", {}),
+            "workflow_status": "completed"
+        }
+    
     def _save_meeting_data(self, email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any]) -> Dict[str, Any]:
         """Save complete meeting data to database."""
         try:
-            meeting_data = {
-                "email_context": {
-                    "sender_email": email_data.get("sender_email", ""),
-                    "sender_name": email_data.get("sender_name", ""),
-                    "subject": email_data.get("subject", ""),
-                    "date_received": email_data.get("date_received", ""),
-                    "message_id": email_data.get("message_id", ""),
-                    "thread_id": email_data.get("thread_id", "")
-                },
-                "analysis_context": {
-                    "hot_lead_detected": analysis_result.get("hot_lead_detected", False),
-                    "meeting_request_detected": analysis_result.get("meeting_request_detected", False),
-                    "hot_lead_score": analysis_result.get("result", {}).get("hot_lead_analysis", {}).get("lead_score", 0),
-                    "confidence": analysis_result.get("result", {}).get("hot_lead_analysis", {}).get("confidence", 0.0)
-                },
-                "meeting_details": meeting_result.get("meeting_data", {}),
-                "workflow_status": "completed"
-            }
-            
-            save_result = self.save_meeting_tool._run(meeting_data)
-            return save_result
+            meeting_data = self._build_meeting_document(email_data, analysis_result, meeting_result)
+            return self.save_meeting_tool.save_many([meeting_data])
             
         except Exception as e:
             self.logger.error(f"Error saving meeting data: {str(e)}")
@@ -157,19 +281,18 @@ class PostActionAgent:
             self.logger.error(f"Error marking email as read: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def _send_completion_notification(self, email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Send completion notification to UI."""
+    def _send_completion_notification(self, email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any],
+                                      now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Send completion notification to UI (batch callers pass one shared `now`)."""
         try:
-            import os
-            from datetime import datetime
-            
+            now = now or datetime.now(timezone.utc)
             notification_data = {
-                "workflow_status": "completed",
-                "timestamp": datetime.utcnow().isoformat(),
+                **_COMPLETION_TEMPLATE,
+                "timestamp": now,
                 "email_summary": {
                     "sender": email_data.get("sender_email", ""),
                     "subject": email_data.get("subject", ""),
-                    "date_processed": datetime.utcnow().isoformat()
+                    "date_processed": now
                 },
                 "analysis_results": {
                     "hot_lead_detected": analysis_result.get("hot_lead_detected", False),
@@ -191,6 +314,7 @@ class PostActionAgent:
     def _generate_workflow_summary(self, email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate comprehensive workflow summary."""
         try:
+            hot_lead_analysis = (analysis_result.get("result") or _EMPTY).get("hot_lead_analysis") or _EMPTY
             summary = {
                 "processed_email": {
                     "sender": email_data.get("sender_email", ""),
@@ -200,8 +324,8 @@ class PostActionAgent:
                 "lead_analysis": {
                     "is_hot_lead": analysis_result.get("hot_lead_detected", False),
                     "is_meeting_request": analysis_result.get("meeting_request_detected", False),
-                    "confidence_score": analysis_result.get("result", {}).get("hot_lead_analysis", {}).get("confidence", 0.0),
-                    "lead_score": analysis_result.get("result", {}).get("hot_lead_analysis", {}).get("lead_score", 0)
+                    "confidence_score": hot_lead_analysis.get("confidence", 0.0),
+                    "lead_score": hot_lead_analysis.get("lead_score", 0)
                 },
                 "meeting_scheduling": {
                     "meeting_scheduled": meeting_result.get("meeting_scheduled", False),
@@ -230,7 +354,34 @@ class PostActionAgent:
             return {"error": str(e)}
 
 
+@lru_cache(maxsize=1)
+def get_post_action_agent() -> PostActionAgent:
+    """Return the process-wide PostActionAgent so each email reuses it."""
+    return PostActionAgent()
+
+
 def run_post_action(email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any]) -> Dict[str, Any]:
     """Run post action agent."""
-    agent = PostActionAgent()
-    return agent.finalize_workflow(email_data, analysis_result, meeting_result)
\ No newline at end of file
+    return get_post_action_agent().finalize_workflow(email_data, analysis_result, meeting_result)
+
+
+def build_post_action_record(email_data: Dict[str, Any], analysis_result: Dict[str, Any], meeting_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Collect what post actions need for one email without performing any side effects."""
+    meeting_document: Optional[Dict[str, Any]] = None
+    if meeting_result.get("meeting_scheduled", False) and meeting_result.get("meeting_data"):
+        meeting_document = PostActionAgent._build_meeting_document(email_data, analysis_result, meeting_result)
+    
+    return {
+        "email_data": email_data,
+        "analysis_result": analysis_result,
+        "meeting_result": meeting_result,
+        "message_id": email_data.get("message_id", ""),
+        "meeting_document": meeting_document
+    }
+
+
+def flush_post_actions(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run post actions for many emails with one meeting insert and one mark-read call."""
+    if not records:
+        return []
+    return get_post_action_agent().finalize_records(records)
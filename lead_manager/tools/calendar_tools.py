@@ -3,20 +3,40 @@ Calendar management tools for Lead Manager.
 """
 
 import os
+import hashlib
 import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 from lead_manager.config import LeadManagerConfig
 
 logger = logging.getLogger(__name__)
 
+# Mock availability offers one slot per business hour on weekdays
+_SLOT_HOURS = tuple(range(LeadManagerConfig.BUSINESS_HOURS_START, LeadManagerConfig.BUSINESS_HOURS_END))
+_SLOT_DURATION = timedelta(minutes=LeadManagerConfig.MEETING_DURATION)
+_WEEKEND_DAYS = frozenset((5, 6))
+
+
+def _meeting_id(*parts: str) -> str:
+    """Stable meeting ID: a 64-bit blake2b digest of parts, identical across processes (unlike hash())."""
+    digest = hashlib.blake2b(digest_size=8)
+    for index, part in enumerate(parts):
+        if index:
+            digest.update(b"|")
+        digest.update(part.encode("utf-8"))
+    return f"meeting_{digest.hexdigest()}"
+
 
 class AvailabilitySlot(BaseModel):
     start_datetime: str = Field(..., description="Available slot start time in ISO format")
     end_datetime: str = Field(..., description="Available slot end time in ISO format")
     duration_minutes: int = Field(..., description="Duration of the slot in minutes")
+    start_epoch_ms: int = Field(..., description="Slot start as Unix epoch milliseconds, for ordering")
 
 
 class MeetingData(BaseModel):
@@ -28,6 +48,88 @@ class MeetingData(BaseModel):
     google_meet_link: Optional[str] = Field(None, description="Google Meet video link")
 
 
+class BusyIntervals:
+    """
+    Busy calendar intervals kept sorted by start time for overlap queries.
+    
+    Times are epoch seconds. An interval can only overlap [start, end) if it
+    starts before end and no earlier than start minus the longest stored
+    duration, so a query bisects to that window instead of scanning every event.
+    Each event ID holds at most one interval, and intervals are dropped once
+    they have ended.
+    """
+    
+    def __init__(self):
+        self._intervals: List[Tuple[float, float, str]] = []
+        self._starts: List[float] = []
+        self._data: Dict[str, Any] = {}
+        self._max_duration = 0.0
+        self._lock = threading.Lock()
+    
+    def claim(self, start: float, end: float, event_id: str, data: Any) -> Optional[Any]:
+        """
+        Atomically claim [start, end) for event_id, storing data (not None) with it.
+        
+        The checks and the insert happen under one lock, so concurrent callers
+        can never both claim the same window or the same event ID. Returns data
+        when the window was claimed, the data stored earlier when event_id
+        already holds a claim (wherever it is), or None when another event
+        overlaps the window.
+        """
+        with self._lock:
+            self._prune(time.time())
+            existing = self._data.get(event_id)
+            if existing is not None:
+                return existing
+            if self._overlaps(start, end):
+                return None
+            index = bisect_right(self._starts, start)
+            self._starts.insert(index, start)
+            self._intervals.insert(index, (start, end, event_id))
+            self._data[event_id] = data
+            self._max_duration = max(self._max_duration, end - start)
+            return data
+    
+    def get(self, event_id: str) -> Optional[Any]:
+        """Return the data stored with event_id's claim, if it has one."""
+        with self._lock:
+            return self._data.get(event_id)
+    
+    def overlapping(self, start: float, end: float) -> List[Tuple[float, float, str]]:
+        """Return the (start, end, event_id) intervals that overlap [start, end)."""
+        with self._lock:
+            lo, hi = self._window(start, end)
+            return [interval for interval in self._intervals[lo:hi] if interval[1] > start]
+    
+    def overlaps_any(self, start: float, end: float) -> bool:
+        """Return whether any interval overlaps [start, end), stopping at the first one."""
+        with self._lock:
+            return self._overlaps(start, end)
+    
+    def __len__(self) -> int:
+        return len(self._intervals)
+    
+    def _window(self, start: float, end: float) -> Tuple[int, int]:
+        return bisect_right(self._starts, start - self._max_duration), bisect_left(self._starts, end)
+    
+    def _overlaps(self, start: float, end: float) -> bool:
+        lo, hi = self._window(start, end)
+        return any(self._intervals[index][1] > start for index in range(lo, hi))
+    
+    def _prune(self, now: float) -> None:
+        """Drop intervals that started more than the longest duration before now (so have ended)."""
+        cut = bisect_left(self._starts, now - self._max_duration)
+        if cut:
+            for _, _, event_id in self._intervals[:cut]:
+                self._data.pop(event_id, None)
+            del self._starts[:cut]
+            del self._intervals[:cut]
+
+
+# Meetings booked by this process, keyed by meeting ID and checked by CalendarConflictTool
+booked_meetings = BusyIntervals()
+
+
 class CheckAvailabilityTool(BaseTool):
     """Tool to check Google Calendar availability for meetings."""
     
@@ -55,7 +157,7 @@ class CheckAvailabilityTool(BaseTool):
             
             return {
                 "success": True,
-                "available_slots": [slot.dict() for slot in availability_slots],
+                "available_slots": availability_slots,
                 "total_slots": len(availability_slots),
                 "business_hours": f"{LeadManagerConfig.BUSINESS_HOURS_START}:00 - {LeadManagerConfig.BUSINESS_HOURS_END}:00",
                 "days_checked": days_ahead
@@ -70,32 +172,33 @@ class CheckAvailabilityTool(BaseTool):
                 "total_slots": 0
             }
     
-    def _generate_mock_availability(self, days_ahead: int) -> List[AvailabilitySlot]:
-        """Generate mock availability slots."""
+    def _generate_mock_availability(self, days_ahead: int) -> List[Dict[str, Any]]:
+        """
+        Generate mock availability slots.
+        
+        Slots are plain dicts with the AvailabilitySlot fields; the values are
+        built here, so model validation would only re-check them.
+        """
         slots = []
-        today = datetime.now()
+        today = datetime.now().replace(minute=0, second=0, microsecond=0)
+        duration_minutes = LeadManagerConfig.MEETING_DURATION
         
         for day_offset in range(days_ahead):
             current_date = today + timedelta(days=day_offset)
             
             # Skip weekends (Saturday=5, Sunday=6)
-            if current_date.weekday() in [5, 6]:
+            if current_date.weekday() in _WEEKEND_DAYS:
                 continue
-                
-            # Business hours
-            start_hour = LeadManagerConfig.BUSINESS_HOURS_START
-            end_hour = LeadManagerConfig.BUSINESS_HOURS_END
             
-            # Generate time slots every hour
-            for hour in range(start_hour, end_hour):
-                slot_start = current_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-                slot_end = slot_start + timedelta(minutes=LeadManagerConfig.MEETING_DURATION)
-                
-                slots.append(AvailabilitySlot(
-                    start_datetime=slot_start.isoformat(),
-                    end_datetime=slot_end.isoformat(),
-                    duration_minutes=LeadManagerConfig.MEETING_DURATION
-                ))
+            # Generate time slots every business hour
+            for hour in _SLOT_HOURS:
+                slot_start = current_date.replace(hour=hour)
+                slots.append({
+                    "start_datetime": slot_start.isoformat(),
+                    "end_datetime": (slot_start + _SLOT_DURATION).isoformat(),
+                    "duration_minutes": duration_minutes,
+                    "start_epoch_ms": int(slot_start.timestamp() * 1000)
+                })
         
         return slots
 
@@ -106,7 +209,8 @@ class CreateMeetingTool(BaseTool):
     name: str = "create_meeting_tool"
     description: str = "Create Google Calendar meeting with Google Meet integration"
     
-    def _run(self, title: str, attendee_email: str, start_datetime: str, duration_minutes: int = 60) -> Dict[str, Any]:
+    def _run(self, title: str, attendee_email: str, start_datetime: str, duration_minutes: int = 60,
+             booking_key: Optional[str] = None) -> Dict[str, Any]:
         """
         Create a Google Calendar meeting.
         
@@ -115,10 +219,22 @@ class CreateMeetingTool(BaseTool):
             attendee_email: Email of the attendee
             start_datetime: Start time in ISO format
             duration_minutes: Meeting duration in minutes
+            booking_key: What the meeting is booked for (e.g. the email's message ID);
+                a key that already has a meeting gets that meeting back instead of a new one
             
         Returns:
             Dictionary with meeting creation results
         """
+        return self._create_meeting(title, attendee_email, start_datetime, duration_minutes, booking_key)
+    
+    @staticmethod
+    def existing_meeting(booking_key: str) -> Optional[Dict[str, Any]]:
+        """Return the meeting already booked for booking_key (marked already_booked), if any."""
+        existing = booked_meetings.get(_meeting_id(booking_key))
+        return {**existing, "already_booked": True} if existing is not None else None
+    
+    def _create_meeting(self, title: str, attendee_email: str, start_datetime: str,
+                        duration_minutes: int = 60, booking_key: Optional[str] = None) -> Dict[str, Any]:
         try:
             logger.info(f"Creating meeting: {title} with {attendee_email}")
             
@@ -126,6 +242,11 @@ class CreateMeetingTool(BaseTool):
             start_time = datetime.fromisoformat(start_datetime)
             end_time = start_time + timedelta(minutes=duration_minutes)
             
+            meeting_id = (
+                _meeting_id(booking_key) if booking_key
+                else _meeting_id(title, attendee_email, start_datetime)
+            )
+            
             # Generate Google Meet link (mock)
             meet_link = f"https://meet.google.com/abc-defg-hij"
             
@@ -142,15 +263,31 @@ class CreateMeetingTool(BaseTool):
                 google_meet_link=meet_link
             )
             
-            logger.info(f"Meeting created successfully: {title}")
-            
-            return {
+            meeting_result = {
                 "success": True,
-                "meeting_id": f"meeting_{hash(title + attendee_email + start_datetime)}",
+                "meeting_id": meeting_id,
                 "meeting_data": meeting_data.dict(),
                 "invitation_sent": True
             }
             
+            # Claim the time atomically: a concurrent booking of an overlapping slot loses,
+            # and a key that was already booked gets its existing meeting back
+            claimed = booked_meetings.claim(start_time.timestamp(), end_time.timestamp(), meeting_id, meeting_result)
+            if claimed is None:
+                logger.info(f"Slot {start_datetime} was booked by another meeting")
+                return {
+                    "success": False,
+                    "error": "Slot already booked",
+                    "slot_taken": True,
+                    "meeting_id": None
+                }
+            if claimed is not meeting_result:
+                logger.info(f"Meeting {meeting_id} was already booked, returning it")
+                return {**claimed, "already_booked": True}
+            
+            logger.info(f"Meeting created successfully: {title}")
+            return meeting_result
+            
         except Exception as e:
             logger.error(f"Error creating meeting: {str(e)}")
             return {
@@ -189,13 +326,14 @@ class CalendarConflictTool(BaseTool):
     name: str = "calendar_conflict_tool"
     description: str = "Detect and suggest resolution for calendar conflicts"
     
-    def _run(self, proposed_datetime: str, duration_minutes: int = 60) -> Dict[str, Any]:
+    def _run(self, proposed_datetime: str, duration_minutes: int = 60, detailed: bool = True) -> Dict[str, Any]:
         """
         Check for calendar conflicts.
         
         Args:
             proposed_datetime: Proposed meeting start time
             duration_minutes: Meeting duration
+            detailed: List every conflict; when False only has_conflicts is returned
             
         Returns:
             Dictionary with conflict resolution info
@@ -204,6 +342,9 @@ class CalendarConflictTool(BaseTool):
             proposed_start = datetime.fromisoformat(proposed_datetime)
             proposed_end = proposed_start + timedelta(minutes=duration_minutes)
             
+            if not detailed:
+                return {"has_conflicts": self.has_conflict(proposed_start, proposed_end)}
+            
             # Simple conflict checking (business hours only)
             start_hour = proposed_start.hour
           
@@ -229,6 +370,17 @@ class CalendarConflictTool(BaseTool):
                     "message": "Meeting is scheduled for weekend"
                 })
             
+            # Check meetings already booked in this window
+            for start_ts, end_ts, meeting_id in booked_meetings.overlapping(
+                proposed_start.timestamp(), proposed_end.timestamp()
+            ):
+                conflicts.append({
+                    "type": "meeting_overlap",
+                    "message": f"Overlaps meeting {meeting_id} "
+                               f"({datetime.fromtimestamp(start_ts).isoformat()} - {datetime.fromtimestamp(end_ts).isoformat()})",
+                    "meeting_id": meeting_id
+                })
+            
             return {
                 "has_conflicts": len(conflicts) > 0,
                 "conflicts": conflicts,
@@ -243,6 +395,15 @@ class CalendarConflictTool(BaseTool):
                 "error": str(e)
             }
     
+    def has_conflict(self, start_dt: datetime, end_dt: datetime) -> bool:
+        """Return whether the meeting would conflict, without building conflict details."""
+        return (
+            start_dt.hour < LeadManagerConfig.BUSINESS_HOURS_START
+            or end_dt.hour > LeadManagerConfig.BUSINESS_HOURS_END
+            or start_dt.weekday() in _WEEKEND_DAYS
+            or booked_meetings.overlaps_any(start_dt.timestamp(), end_dt.timestamp())
+        )
+    
     def _get_conflict_resolution(self, conflicts: List[Dict]) -> str:
         """Suggest conflict resolution."""
         if not conflicts:
@@ -254,6 +415,9 @@ class CalendarConflictTool(BaseTool):
         if any(c["type"] == "weekend_conflict" for c in conflicts):
             return "Suggest rescheduling to weekday"
         
+        if any(c["type"] == "meeting_overlap" for c in conflicts):
+            return "Suggest another available slot"
+        
         return "Manual review required"
 
 
@@ -6,11 +6,13 @@ import os
 import base64
 import logging
 import re
+import threading
 from datetime import datetime
-from typing import Any, Dict, List, Optional, AsyncGenerator
+from typing import Any, Dict, List, Optional, Union, AsyncGenerator
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-from email.utils import parsedate_to_datetime
+from email.utils import getaddresses, parseaddr, parsedate_to_datetime
+from lead_manager.config import LeadManagerConfig, GMAIL_UNREAD_QUERY
 
 try:
     from google.auth.transport.requests import Request
@@ -21,6 +23,12 @@ try:
 except ImportError:
     GMAIL_API_AVAILABLE = False
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -30,6 +38,46 @@ TOKEN_FILE = os.getenv("TOKEN_FILE", ".secrets/token.json")
 GMAIL_SCOPES = [
     'https://www.googleapis.com/auth/gmail.readonly'
 ]
+if LeadManagerConfig.GMAIL_MARK_READ_ENABLED:
+    GMAIL_SCOPES.append('https://www.googleapis.com/auth/gmail.modify')
+GMAIL_PAGE_SIZE = int(os.getenv("GMAIL_PAGE_SIZE", "50"))
+# Gmail batch endpoint accepts at most 100 calls per HTTP request
+GMAIL_BATCH_SIZE = 100
+# users.messages.batchModify accepts at most 1000 message IDs per call
+GMAIL_BATCH_MODIFY_LIMIT = 1000
+DEFAULT_UNREAD_QUERY = "is:unread"
+# Thread summaries only read these headers, so threads are fetched without bodies
+THREAD_METADATA_HEADERS = ['From', 'To']
+
+# Authorized Gmail client reused across tool calls. Credentials are shared by the
+# process; the service object (its httplib2 transport is not thread-safe) per thread.
+_gmail_credentials = None
+_gmail_auth_lock = threading.Lock()
+_gmail_local = threading.local()
+
+# Elements whose content is never visible text
+_NON_TEXT_TAGS = ['head', 'script', 'style', 'noscript']
+
+# Regex fallback when selectolax is not installed: every HTML/CSS noise pattern
+# as one alternation, so the body is scanned once.
+# Alternatives are tried in this order at each position; only mailto keeps text.
+_HTML_NOISE_PATTERN = re.compile(
+    r'<[^>]+>'                                  # HTML tags
+    r'|\{[^}]*\}'                               # CSS rule bodies
+    r'|@media[^}]*}'                            # media queries
+    r'|@[a-zA-Z]+[^;}]*[;}][^;}]*'              # other CSS at-rules
+    r'|style\s*=\s*["\'][^"\']*["\']'           # style attributes
+    r'|\w+="[^"]*"|\w+=\'[^\']*\'|\w+=[^>\s]+'  # HTML attributes
+    r'|[a-zA-Z-]+\s*:\s*[^;]+;'                 # CSS properties
+    r'|[.#][A-Za-z][A-Za-z0-9_\-]*'             # CSS selectors and class names
+    r'|&(?P<entity>[a-zA-Z0-9#]+);'             # HTML entities
+    r'|mailto:(?P<mailto>[^>\s]+)'              # mailto links (address kept)
+    r'|https?://[^\s]+'                         # absolute URLs
+)
+_HTML_ENTITIES = {'nbsp': ' ', 'amp': '&', 'lt': '<', 'gt': '>'}
+_FOOTER_PATTERN = re.compile(r'(?:© \d{4}|You have received this|Unsubscribe|To unsubscribe).*$', re.MULTILINE)
+_PLAIN_HEADER_PATTERN = re.compile(r'^(?:From|To|Subject|Date):.*$', re.MULTILINE)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
 
 
 class EmailMessage(BaseModel):
@@ -46,6 +94,52 @@ class EmailMessage(BaseModel):
     )
 
 
+def _replace_html_noise(match):
+    mailto = match.group('mailto')
+    if mailto is not None:
+        return mailto
+    return _HTML_ENTITIES.get(match.group('entity'), '')
+
+
+def clean_plain_text(text):
+    """Clean plain text without aggressive HTML removal"""
+    if not text:
+        return ""
+    
+    # Remove email headers, then clean up whitespace
+    text = _PLAIN_HEADER_PATTERN.sub('', text)
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def decode_to_clean_text(text: Union[bytes, str]) -> str:
+    """
+    Clean up the extracted text by removing HTML, CSS, and formatting noise.
+    
+    Accepts the raw UTF-8 bytes of an HTML part; selectolax parses them
+    directly, so only the extracted text is ever decoded to str.
+    """
+    if not text:
+        return ""
+    
+    if SELECTOLAX_AVAILABLE:
+        # Tokenize in C and keep only the visible text nodes (entities decoded)
+        tree = HTMLParser(text)
+        tree.strip_tags(_NON_TEXT_TAGS)
+        root = tree.body or tree.root
+        clean_text = root.text(separator=' ') if root is not None else ''
+    else:
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', 'replace')
+        # Remove tags, CSS, attributes, entities and URLs in a single pass
+        clean_text = _HTML_NOISE_PATTERN.sub(_replace_html_noise, text)
+    
+    # Collapse whitespace, then drop email footers and signatures (common patterns)
+    clean_text = _WHITESPACE_PATTERN.sub(' ', clean_text)
+    clean_text = _FOOTER_PATTERN.sub('', clean_text)
+    
+    return clean_text.strip()
+
+
 def extract_message_body(message):
     """Extract clean text body from Gmail message, removing HTML and CSS"""
     body = ""
@@ -57,95 +151,16 @@ def extract_message_body(message):
             data = part.get('body', {}).get('data')
             if data:
                 # Plain text doesn't need HTML cleaning, but still clean basic formatting
-                return clean_plain_text(base64.urlsafe_b64decode(data).decode('utf-8'))
+                return clean_plain_text(base64.urlsafe_b64decode(data).decode('utf-8', 'replace'))
         
         elif mime_type == 'text/html':
             data = part.get('body', {}).get('data')
             if data:
-                html_content = base64.urlsafe_b64decode(data).decode('utf-8')
-                return decode_to_clean_text(html_content)
+                # Hand the decoded bytes over as-is; the cleaner decodes only the text it keeps
+                return decode_to_clean_text(base64.urlsafe_b64decode(data))
         
         return ""
     
-    def clean_plain_text(text):
-        """Clean plain text without aggressive HTML removal"""
-        if not text:
-            return ""
-        
-        import re
-        
-        # Remove email headers
-        text = re.sub(r'^From:.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^To:.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^Subject:.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^Date:.*$', '', text, flags=re.MULTILINE)
-        
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        return text.strip()
-    
-    def decode_to_clean_text(text):
-        """Clean up the extracted text by removing HTML, CSS, and formatting noise"""
-        if not text:
-            return ""
-        
-        import re
-        
-        # Remove HTML tags completely
-        clean_text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove CSS styles and rules (everything between curly braces)
-        clean_text = re.sub(r'\{[^}]*\}', '', clean_text)
-        
-        # Remove CSS selectors and class names
-        clean_text = re.sub(r'[.#][A-Za-z][A-Za-z0-9_\-]*', '', clean_text)
-        
-        # Remove HTML attributes (key="value" or key=value)
-        clean_text = re.sub(r'\w+="[^"]*"', '', clean_text)
-        clean_text = re.sub(r"\w+='[^']*'", '', clean_text)
-        clean_text = re.sub(r'\w+=[^>\s]+', '', clean_text)
-        
-        # Remove media queries and CSS at-rules
-        clean_text = re.sub(r'@media[^}]*}', '', clean_text, flags=re.DOTALL)
-        clean_text = re.sub(r'@[a-zA-Z]+[^;}]*[;}][^;}]*', '', clean_text)
-        
-        # Remove CSS properties (property: value;)
-        clean_text = re.sub(r'[a-zA-Z-]+\s*:\s*[^;]+;', '', clean_text)
-        
-        # Remove style attributes content
-        clean_text = re.sub(r'style\s*=\s*["\'][^"\']*["\']', '', clean_text)
-        
-        # Remove HTML entities
-        clean_text = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_text)
-        clean_text = re.sub(r'&nbsp;', ' ', clean_text)
-        clean_text = re.sub(r'&amp;', '&', clean_text)
-        clean_text = re.sub(r'&lt;', '<', clean_text)
-        clean_text = re.sub(r'&gt;', '>', clean_text)
-        
-        # Remove JavaScript and script content
-        clean_text = re.sub(r'<script[^>]*>.*?</script>', '', clean_text, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Remove mailto links but keep the email part
-        clean_text = re.sub(r'mailto:([^>\s]+)', r'\1', clean_text)
-        
-        # Remove absolute URLs but keep relative text
-        clean_text = re.sub(r'https?://[^\s]+', '', clean_text)
-        
-        # Clean up whitespace and formatting
-        clean_text = re.sub(r'\s+', ' ', clean_text)
-        clean_text = re.sub(r'\n\s*\n', '\n\n', clean_text)
-        clean_text = re.sub(r'^\s+|\s+$', '', clean_text, flags=re.MULTILINE)
-        
-        # Remove email footers and signatures (common patterns)
-        clean_text = re.sub(r'© \d{4}.*$', '', clean_text, flags=re.MULTILINE)
-        clean_text = re.sub(r'You have received this.*$', '', clean_text, flags=re.MULTILINE)
-        clean_text = re.sub(r'Unsubscribe.*$', '', clean_text, flags=re.MULTILINE)
-        clean_text = re.sub(r'To unsubscribe.*$', '', clean_text, flags=re.MULTILINE)
-        
-        return clean_text.strip()
-    
     payload = message.get('payload', {})
     
     # Priority: Look for plain text first
@@ -158,7 +173,7 @@ def extract_message_body(message):
             plain_text_found = True
             body = extract_text_from_part(payload)
         elif mime_type == 'text/html':
-            body = decode_to_clean_text(base64.urlsafe_b64decode(payload.get('body', {}).get('data')).decode('utf-8'))
+            body = extract_text_from_part(payload)
     
     # Multi-part message
     elif payload.get('parts'):
@@ -183,11 +198,11 @@ def extract_message_body(message):
                 if part.get('parts'):  # Nested parts
                     for nested_part in part['parts']:
                         if nested_part.get('mimeType') == 'text/html':
-                            html_text = decode_to_clean_text(base64.urlsafe_b64decode(nested_part.get('body', {}).get('data')).decode('utf-8'))
+                            html_text = extract_text_from_part(nested_part)
                             if html_text:
                                 body += html_text + "\n\n"
                 elif part.get('mimeType') == 'text/html':
-                    html_text = decode_to_clean_text(base64.urlsafe_b64decode(part.get('body', {}).get('data')).decode('utf-8'))
+                    html_text = extract_text_from_part(part)
                     if html_text:
                         body += html_text + "\n\n"
     
@@ -197,11 +212,15 @@ def extract_message_body(message):
     return body.strip() if body else ""
 
 
+def _header_map(headers):
+    """Map header name to value in one pass; the first occurrence of a repeated header wins"""
+    return {h['name']: h['value'] for h in reversed(headers)}
+
+
 def extract_email_address(email_string):
     """Extract email address from 'Name <email@domain.com>' format"""
-    if '<' in email_string and '>' in email_string:
-        return email_string.split('<')[1].split('>')[0]
-    return email_string.strip()
+    address = parseaddr(email_string)[1]
+    return address if '@' in address else email_string.strip()
 
 
 def get_thread_details(service, thread_id):
@@ -209,37 +228,64 @@ def get_thread_details(service, thread_id):
     try:
         thread = service.users().threads().get(
             userId='me',
-            id=thread_id
+            id=thread_id,
+            format='metadata',
+            metadataHeaders=THREAD_METADATA_HEADERS
         ).execute()
         
+        return summarize_thread(thread)
+        
+    except Exception as e:
+        logger.warning(f"Error getting thread details: {e}")
+        return {'message_count': 1, 'participants': frozenset(('Unknown',))}
+
+
+def summarize_thread(thread):
+    """
+    Count the messages of a fetched Gmail thread and collect its participants.
+    
+    Participants are a frozenset for membership checks; convert to a list
+    before JSON-serializing a summary.
+    """
+    try:
         messages = thread.get('messages', [])
         participants = set()
         
         for msg in messages:
-            headers = msg['payload'].get('headers', [])
-            from_header = next((h['value'] for h in headers if h['name'] == 'From'), '')
-            to_header = next((h['value'] for h in headers if h['name'] == 'To'), '')
+            headers = _header_map(msg['payload'].get('headers', []))
+            from_header = headers.get('From', '')
+            to_header = headers.get('To', '')
             
             # Extract email addresses
             if from_header:
                 participants.add(extract_email_address(from_header))
             if to_header:
-                for email in to_header.split(','):
-                    participants.add(extract_email_address(email.strip()))
+                # getaddresses handles quoted display names that contain commas
+                participants.update(address for _, address in getaddresses([to_header]) if address)
         
         return {
             'message_count': len(messages),
-            'participants': list(participants)
+            'participants': frozenset(participants)
         }
         
     except Exception as e:
-        logger.warning(f"Error getting thread details: {e}")
-        return {'message_count': 1, 'participants': ['Unknown']}
+        logger.warning(f"Error summarizing thread: {e}")
+        return {'message_count': 1, 'participants': frozenset(('Unknown',))}
 
 
 def _authenticate_gmail_service():
-    """Authenticate with Gmail API using OAuth2."""
+    """
+    Authenticate with Gmail API using OAuth2.
+    
+    The token file is read and the service built once; later calls reuse them
+    and only refresh the credentials once they have expired.
+    """
+    global _gmail_credentials
     try:
+        creds = _gmail_credentials
+        if creds is not None and creds.valid and getattr(_gmail_local, "credentials", None) is creds:
+            return _gmail_local.service
+        
         if not GMAIL_API_AVAILABLE:
             print("❌ Gmail API dependencies not installed")
             print("💡 Run: pip install google-auth google-auth-oauthlib google-api-python-client")
@@ -256,120 +302,240 @@ def _authenticate_gmail_service():
             print(f"5. Place it at: {GOOGLE_CREDENTIALS_FILE}")
             return None
         
-        print(f"🔗 Authenticating with Gmail API using OAuth2...")
-        print(f"📧 Credentials file: {GOOGLE_CREDENTIALS_FILE}")
-        
-        creds = None
-        # Load token if it exists
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, GMAIL_SCOPES)
-        
-        # If there are no valid credentials, request authorization
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                print("🔄 Refreshing expired credentials...")
-                creds.refresh(Request())
-            else:
-                print("🔗 Starting OAuth2 authentication flow...")
-                flow = InstalledAppFlow.from_client_secrets_file(GOOGLE_CREDENTIALS_FILE, GMAIL_SCOPES)
-                creds = flow.run_local_server(port=0)
+        with _gmail_auth_lock:
+            creds = _gmail_credentials
+            if creds is None:
+                print(f"🔗 Authenticating with Gmail API using OAuth2...")
+                print(f"📧 Credentials file: {GOOGLE_CREDENTIALS_FILE}")
+                
+                # Load token if it exists
+                if os.path.exists(TOKEN_FILE):
+                    creds = Credentials.from_authorized_user_file(TOKEN_FILE, GMAIL_SCOPES)
             
-            # Save credentials for next run
-            with open(TOKEN_FILE, 'w') as token:
-                token.write(creds.to_json())
+            # If there are no valid credentials, request authorization
+            if not creds or not creds.valid:
+                if creds and creds.expired and creds.refresh_token:
+                    print("🔄 Refreshing expired credentials...")
+                    creds.refresh(Request())
+                else:
+                    print("🔗 Starting OAuth2 authentication flow...")
+                    flow = InstalledAppFlow.from_client_secrets_file(GOOGLE_CREDENTIALS_FILE, GMAIL_SCOPES)
+                    creds = flow.run_local_server(port=0)
+                
+                # Save credentials for next run
+                with open(TOKEN_FILE, 'w') as token:
+                    token.write(creds.to_json())
+            
+            _gmail_credentials = creds
         
-        service = build('gmail', 'v1', credentials=creds)
-        print("✅ Gmail API OAuth2 authentication successful")
-        return service
+        # Refreshing updates creds in place, so a service is rebuilt only for new credentials
+        if getattr(_gmail_local, "credentials", None) is not creds:
+            # Discovery document ships with the client library; skip its file cache
+            _gmail_local.service = build('gmail', 'v1', credentials=creds, cache_discovery=False)
+            _gmail_local.credentials = creds
+            print("✅ Gmail API OAuth2 authentication successful")
+        return _gmail_local.service
         
     except Exception as e:
         logger.error(f"❌ Gmail OAuth2 authentication error: {e}")
         return None
 
 
-def _get_unread_emails_from_gmail():
-    """Get unread emails from Gmail using OAuth2 authentication."""
+def _batch_execute(service, requests):
+    """
+    Run Gmail API requests through the batch endpoint.
+    
+    Takes (request_id, request) pairs and sends one HTTP request per
+    GMAIL_BATCH_SIZE of them instead of one per request. Returns
+    {request_id: response}; requests that failed are logged and omitted.
+    """
+    fetched = {}
+    
+    def collect(request_id, response, exception):
+        if exception is not None:
+            logger.warning(f"Error fetching {request_id}: {exception}")
+        else:
+            fetched[request_id] = response
+    
+    for start in range(0, len(requests), GMAIL_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=collect)
+        for request_id, request in requests[start:start + GMAIL_BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+    
+    return fetched
+
+
+def _batch_get_page(service, listed_messages, known_threads=()):
+    """
+    Fetch a list page's messages and their threads in the same batch requests.
+    
+    messages.list already returns each message's threadId, so the thread
+    fetches do not have to wait for the messages. Each distinct thread is
+    fetched once, and threads in known_threads are not fetched at all.
+    Returns ({message_id: message}, {thread_id: thread summary}).
+    """
+    messages = service.users().messages()
+    threads = service.users().threads()
+    thread_ids = dict.fromkeys(
+        message['threadId'] for message in listed_messages
+        if message.get('threadId') and message['threadId'] not in known_threads
+    )
+    
+    requests = [
+        (f"message:{message['id']}", messages.get(userId='me', id=message['id'], format='full'))
+        for message in listed_messages
+    ]
+    requests.extend(
+        (f"thread:{thread_id}", threads.get(
+            userId='me', id=thread_id, format='metadata', metadataHeaders=THREAD_METADATA_HEADERS
+        ))
+        for thread_id in thread_ids
+    )
+    fetched = _batch_execute(service, requests)
+    
+    fetched_messages = {}
+    thread_details = {}
+    for request_id, response in fetched.items():
+        kind, _, item_id = request_id.partition(':')
+        if kind == 'message':
+            fetched_messages[item_id] = response
+        else:
+            thread_details[item_id] = summarize_thread(response)
+    return fetched_messages, thread_details
+
+
+def mark_messages_read(service, message_ids):
+    """Remove the UNREAD label from messages with one batchModify call per 1000 IDs."""
+    for start in range(0, len(message_ids), GMAIL_BATCH_MODIFY_LIMIT):
+        service.users().messages().batchModify(
+            userId='me',
+            body={'ids': message_ids[start:start + GMAIL_BATCH_MODIFY_LIMIT], 'removeLabelIds': ['UNREAD']}
+        ).execute()
+    return len(message_ids)
+
+
+def _build_email_data(service, msg, thread_info=None):
+    """
+    Convert a full-format Gmail message to the email data dictionary.
+    
+    thread_info is the prefetched summary of the message's thread; the thread
+    is fetched on its own when it is not given.
+    """
+    message_id = msg['id']
+    
+    # Extract headers
+    headers = _header_map(msg['payload'].get('headers', []))
+    subject = headers.get('Subject', 'No Subject')
+    sender = headers.get('From', 'Unknown Sender')
+    date_hdr = headers.get('Date', 'No Date')
+    thread_id = msg.get('threadId', '')
+    
+    # Get message body
+    body = extract_message_body(msg)
+    
+    # Get thread details (unless prefetched in a batch)
+    if thread_info is None:
+        thread_info = get_thread_details(service, thread_id)
+    
+    # Convert header date to ISO format for JSON serialization
+    try:
+        dt = parsedate_to_datetime(date_hdr)
+        date_received = dt.isoformat()
+    except Exception:
+        date_received = date_hdr
+    
+    # Extract sender name and email address
+    sender_name, sender_email = parseaddr(sender)
+    if '@' not in sender_email:
+        sender_email = sender.strip()
+    sender_name = sender_name or sender_email.split('@')[0]
+    
+    return {
+        'sender_email': sender_email,
+        'message_id': message_id,
+        'thread_id': thread_id,
+        'sender_name': sender_name,
+        'subject': subject,
+        'body': body,
+        'date_received': date_received,
+        'thread_conversation_history': []
+    }
+
+
+def iter_unread_emails_from_gmail(max_results: Optional[int] = None, page_size: int = GMAIL_PAGE_SIZE,
+                                  query: str = DEFAULT_UNREAD_QUERY):
+    """
+    Yield unread emails one at a time as Gmail list pages arrive.
+    
+    Lets callers start processing the first emails while later pages and
+    messages are still being downloaded.
+    
+    Args:
+        max_results: Maximum number of emails to yield (None for all unread)
+        page_size: Number of message IDs requested per list page
+        query: Gmail search query (server-side filtering, defaults to all unread)
+    """
     try:
         logger.info("🔍 Checking unread emails...")
         
         # Authenticate
         service = _authenticate_gmail_service()
         if not service:
-            return []
-        
-        # Get unread messages (limited to first 10)
-        results = service.users().messages().list(
-            userId='me',
-            q='is:unread',
-            maxResults=1
-        ).execute()
-        
-        messages = results.get('messages', [])
-        
-        if not messages:
-            logger.info("✅ No unread emails found!")
-            return []
-        
-        logger.info(f"📧 Found {len(messages)} unread email(s)")
-        
-        unread_emails = []
-        
-        for i, message in enumerate(messages, 1):
-            message_id = message['id']
-            
-            # Get detailed message info
-            msg = service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
-            
-            # Extract headers
-            headers = msg['payload'].get('headers', [])
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown Sender')
-            date_hdr = next((h['value'] for h in headers if h['name'] == 'Date'), 'No Date')
-            thread_id = msg.get('threadId')
-            
-            # Get message body
-            body = extract_message_body(msg)
-            
-            # Get thread details
-            thread_info = get_thread_details(service, thread_id)
+            return
+        
+        page_token = None
+        yielded = 0
+        # Thread summaries fetched so far in this run; later pages reuse them
+        thread_details = {}
+        
+        while True:
+            remaining = None if max_results is None else max_results - yielded
+            list_params = {
+                'userId': 'me',
+                'q': query,
+                'maxResults': page_size if remaining is None else min(page_size, remaining)
+            }
+            if page_token:
+                list_params['pageToken'] = page_token
             
-            # Convert header date to ISO format for JSON serialization
-            try:
-                dt = parsedate_to_datetime(date_hdr)
-                date_received = dt.isoformat()
-            except Exception:
-                date_received = date_hdr
+            results = service.users().messages().list(**list_params).execute()
             
-            # Extract sender email address
-            sender_email = extract_email_address(sender)
+            messages = results.get('messages', [])
             
-            # Extract sender name
-            sender_name = sender.split('<')[0].strip().strip('"') if '<' in sender else sender_email.split('@')[0]
+            if not messages and yielded == 0:
+                logger.info("✅ No unread emails found!")
+                return
             
-            email_data = {
-                'sender_email': sender_email,
-                'message_id': message_id,
-                'thread_id': thread_id,
-                'sender_name': sender_name,
-                'subject': subject,
-                'body': body,
-                'date_received': date_received,
-                'thread_conversation_history': []
-            }
+            fetched, new_thread_details = _batch_get_page(service, messages, thread_details)
+            thread_details.update(new_thread_details)
             
-            unread_emails.append(email_data)
+            for message in messages:
+                msg = fetched.get(message['id'])
+                if msg is None:
+                    continue
+                
+                email_data = _build_email_data(service, msg, thread_details.get(msg.get('threadId')))
+                yielded += 1
+                
+                logger.info(f"📧 Email #{yielded}: {email_data['sender_email']} - {email_data['subject']}")
+                yield email_data
+                
+                if max_results is not None and yielded >= max_results:
+                    return
             
-            logger.info(f"📧 Email #{i}: {sender_email} - {subject}")
-        
-        return unread_emails
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
         
     except Exception as e:
         logger.error(f"❌ Error getting emails from Gmail: {e}")
-        return []
+
+
+def _get_unread_emails_from_gmail(query: Optional[str] = None):
+    """Get unread emails from Gmail using OAuth2 authentication."""
+    # Get unread messages (limited to the first one)
+    return list(iter_unread_emails_from_gmail(max_results=1, query=query or GMAIL_UNREAD_QUERY))
 
 
 class CheckEmailTool(BaseTool):
@@ -382,18 +548,9 @@ class CheckEmailTool(BaseTool):
         print("📧 Gmail OAuth2 email checker tool called!!")
         
         try:
-            # Get emails from Gmail using OAuth2
-            emails = _get_unread_emails_from_gmail()
-            
-            # Convert to EmailMessage objects and then to dicts
-            structured_emails = []
-            for email_data in emails:
-                try:
-                    email_obj = EmailMessage(**email_data)
-                    structured_emails.append(email_obj.model_dump())
-                except Exception as e:
-                    print(f"❌ Error structuring email: {e}")
-                    continue
+            # Get emails from Gmail using OAuth2. _build_email_data already emits
+            # EmailMessage-shaped dicts, so they are returned without a model round-trip
+            structured_emails = _get_unread_emails_from_gmail(query)
             
             print(f"📊 Returning {len(structured_emails)} structured emails")
             return structured_emails
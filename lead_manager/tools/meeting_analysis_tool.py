@@ -5,11 +5,18 @@ AI-powered meeting analysis tools for Lead Manager.
 import os
 import logging
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 from config.cerebras_client import CerebrasConfig
-from lead_manager.config import LeadManagerConfig
+from leads_finder.llm_config import LLMConfig
+from lead_manager.config import LeadManagerConfig, HOT_LEAD_PATTERN, HOT_LEAD_URGENCY_PATTERN
+from lead_manager.prompts import (
+    MEETING_ANALYSIS_SYSTEM_PROMPT,
+    analysis_messages,
+    format_email_details,
+    get_hot_lead_prompt
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +39,44 @@ class HotLeadAnalysis(BaseModel):
     business_context: str = Field(default="unknown", description="Detected business context")
 
 
+def _json_schema_format(name: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict JSON-schema response_format so decoding stops once every field is emitted."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+MEETING_REQUEST_RESPONSE_FORMAT = _json_schema_format("meeting_request_analysis", {
+    "is_meeting_request": {"type": "boolean"},
+    "confidence": {"type": "number"},
+    "request_type": {"type": "string", "enum": ["explicit", "implicit", "none"]},
+    "urgency": {"type": "string", "enum": ["urgent", "high", "normal", "low"]},
+    "extracted_dates": _STRING_LIST,
+    "extracted_topics": _STRING_LIST
+})
+
+HOT_LEAD_RESPONSE_FORMAT = _json_schema_format("hot_lead_analysis", {
+    "is_hot_lead": {"type": "boolean"},
+    "confidence": {"type": "number"},
+    "lead_score": {"type": "integer"},
+    "lead_source": {"type": "string", "enum": ["prospect", "referral", "inbound", "outbound", "unknown"]},
+    "interest_signals": _STRING_LIST,
+    "business_context": {"type": "string"}
+})
+
+
 class MeetingAnalysisTool(BaseTool):
     """Tool to analyze emails for meeting requests using AI."""
     
@@ -83,50 +128,21 @@ class MeetingAnalysisTool(BaseTool):
                 "fallback_used": True
             }
     
-    def _build_meeting_analysis_prompt(self, email_body: str, sender_email: str, subject: str = "") -> str:
-        """Build prompt for meeting request analysis."""
-        return f"""
-You are an expert email analyst specializing in identifying meeting requests in business emails.
-
-Email Details:
-- From: {sender_email}
-- Subject: {subject}
-- Body: {email_body[:1000]}...
-
-Analyze this email and determine:
-
-1. Does this email contain a meeting request (explicit or implicit)?
-2. What is your confidence level (0.0-1.0)?
-3. What type of meeting request is it?
-4. What is the urgency level?
-5. Are there any specific dates/times mentioned?
-6. What topics would be discussed?
-
-Respond ONLY in valid JSON format:
-{{
-    "is_meeting_request": bool,
-    "confidence": 0.0-1.0,
-    "request_type": "explicit|implicit|none",
-    "urgency": "urgent|high|normal|low",
-    "extracted_dates": ["mentioned dates/times"],
-    "extracted_topics": ["topics to discuss"]
-}}
-
-Meeting request indicators include:
-- Direct requests: "Let's meet", "Schedule a call", "Set up a meeting"
-- Implicit requests: "When are you available?", "Discuss this further", "Chat about"
-- Calendar phrases: "Schedule time", "Book a slot", "Arrange meeting"
-        """
+    def _build_meeting_analysis_prompt(self, email_body: str, sender_email: str, subject: str = "") -> List[Dict[str, str]]:
+        """Build messages for meeting request analysis (static instructions first)."""
+        return analysis_messages(
+            MEETING_ANALYSIS_SYSTEM_PROMPT,
+            f"Email Details:\n{format_email_details(email_body, sender_email, subject)}"
+        )
     
-    def _get_llm_response(self, prompt: str) -> str:
+    def _get_llm_response(self, prompt: Union[str, List[Dict[str, str]]]) -> str:
         """Get response from Cerebras LLM using CrewAI LLM."""
         try:
-            from leads_finder.llm_config import LLMConfig
-            
             llm = LLMConfig.get_cerebras_llm(
-                model=LeadManagerConfig.DEFAULT_MODEL,
+                model=LeadManagerConfig.ANALYSIS_MODEL,
                 temperature=0.3,
-                max_completion_tokens=500
+                max_completion_tokens=500,
+                response_format=MEETING_REQUEST_RESPONSE_FORMAT
             )
             
             response = llm.call(prompt)
@@ -249,56 +265,22 @@ class HotLeadAnalysisTool(BaseTool):
                 "fallback_used": True
             }
     
-    def _build_hot_lead_analysis_prompt(self, email_body: str, sender_email: str, subject: str = "") -> str:
-        """Build prompt for hot lead analysis."""
-        return f"""
-You are an expert sales analyst specializing in identifying hot leads from email communications.
-
-Email Details:
-- From: {sender_email}
-- Subject: {subject}
-- Body: {email_body[:1000]}...
-
-Analyze this email and determine:
-
-1. Is this email sender a potentially hot lead (showing genuine interest)?
-2. What is your confidence score (0.0-1.0)?
-3. What lead qualification score would you give (0-100)?
-4. What is the likely lead source?
-5. What specific signals indicate interest?
-6. What is the business context?
-
-Respond ONLY in valid JSON format:
-{{
-    "is_hot_lead": bool,
-    "confidence": 0.0-1.0,
-    "lead_score": 0-100,
-    "lead_source": "prospect|referral|inbound|outbound|unknown",
-    "interest_signals": ["list of interest indicators"],
-    "business_context": "brief description of business interest"
-}}
-
-Hot lead indicators include:
-- Expressing genuine interest in services/products
-- Asking specific questions about offerings
-- Mentioning budget, timelines, or decision-making process
-- Requesting demos, pricing, or proposals
-- Professional email addresses from business domains
-- Specific business pain points mentioned
-- Mentions of partnerships or collaboration
-
-Avoid identifying automated emails, spam, or promotional content as hot leads.
-        """
+    def _build_hot_lead_analysis_prompt(self, email_body: str, sender_email: str, subject: str = "") -> List[Dict[str, str]]:
+        """Build messages for hot lead analysis (static instructions first)."""
+        sender_domain = sender_email.rpartition("@")[2].strip(" >").lower()
+        return analysis_messages(
+            get_hot_lead_prompt(sender_domain),
+            f"Email Details:\n{format_email_details(email_body, sender_email, subject)}"
+        )
     
-    def _get_llm_response(self, prompt: str) -> str:
+    def _get_llm_response(self, prompt: Union[str, List[Dict[str, str]]]) -> str:
         """Get response from Cerebras LLM using CrewAI LLM."""
         try:
-            from leads_finder.llm_config import LLMConfig
-            
             llm = LLMConfig.get_cerebras_llm(
-                model=LeadManagerConfig.DEFAULT_MODEL,
+                model=LeadManagerConfig.ANALYSIS_MODEL,
                 temperature=0.3,
-                max_completion_tokens=500
+                max_completion_tokens=500,
+                response_format=HOT_LEAD_RESPONSE_FORMAT
             )
             
             response = llm.call(prompt)
@@ -347,17 +329,16 @@ Avoid identifying automated emails, spam, or promotional content as hot leads.
         hot_lead_score = 0
         signals = []
         
-        for keyword in LeadManagerConfig.HOT_LEAD_KEYWORDS:
-            if keyword in combined_text:
-                hot_lead_score += 2
-                signals.append(f"mentions '{keyword}'")
+        # Single regex pass; dict.fromkeys dedupes while keeping first-seen order
+        for keyword in dict.fromkeys(HOT_LEAD_PATTERN.findall(combined_text)):
+            hot_lead_score += 2
+            signals.append(f"mentions '{keyword}'")
         
         # Count urgency keywords
         urgency_signals = []
-        for keyword in LeadManagerConfig.HOT_LEAD_URGENCY_KEYWORDS:
-            if keyword in combined_text:
-                hot_lead_score += 3
-                urgency_signals.append(f"urgency: {keyword}")
+        for keyword in dict.fromkeys(HOT_LEAD_URGENCY_PATTERN.findall(combined_text)):
+            hot_lead_score += 3
+            urgency_signals.append(f"urgency: {keyword}")
         
         signals.extend(urgency_signals)
         
@@ -2,14 +2,19 @@
 MongoDB-based tools for Lead Manager operations.
 """
 
-import os
+import hashlib
 import logging
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-from pymongo import MongoClient
+from pymongo import InsertOne, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from lead_manager.config import LeadManagerConfig
+from lead_manager.notifications import notification_bus
+from lead_manager.tools.check_email_tool import _authenticate_gmail_service, mark_messages_read
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -148,6 +153,90 @@ class SaveMeetingTool(BaseTool):
             }
 
 
+    def save_many(self, meeting_data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Save several meetings to MongoDB with a single unordered bulk_write.
+        
+        Meetings are upserted by source email message_id, so re-running a
+        batch never stores the same meeting twice.
+        
+        Args:
+            meeting_data_list: List of meeting information dictionaries
+            
+        Returns:
+            Dictionary with save operation results
+        """
+        now = datetime.utcnow().isoformat()
+        for meeting_data in meeting_data_list:
+            meeting_data["created_at"] = now
+            meeting_data["updated_at"] = now
+        
+        return write_meetings(meeting_data_list)
+
+
+def _meeting_write_operation(meeting_data: Dict[str, Any]):
+    """Upsert keyed by the source email's message_id; plain insert when there is none."""
+    message_id = meeting_data.get("email_context", {}).get("message_id")
+    if message_id:
+        return UpdateOne(
+            {"email_context.message_id": message_id},
+            {"$setOnInsert": meeting_data},
+            upsert=True
+        )
+    return InsertOne(meeting_data)
+
+
+_meeting_index_ready = False
+
+
+def write_meetings(meeting_data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Write meeting documents to the meetings collection in one unordered bulk_write."""
+    global _meeting_index_ready
+    
+    try:
+        client, database = get_lead_manager_mongodb_client()
+        collection = database["meetings"]
+        
+        if not _meeting_index_ready:
+            collection.create_index("email_context.message_id")
+            _meeting_index_ready = True
+        
+        result = collection.bulk_write(
+            [_meeting_write_operation(meeting_data) for meeting_data in meeting_data_list],
+            ordered=False
+        )
+        saved = result.upserted_count + result.inserted_count
+        
+        logger.info(f"Saved {saved} meetings in one batch ({result.matched_count} already stored)")
+        
+        return {
+            "success": True,
+            "meetings_saved": saved,
+            "meetings_already_stored": result.matched_count,
+            "failed_indices": [],
+            "message": f"Saved {saved} meetings successfully"
+        }
+        
+    except BulkWriteError as e:
+        # Unordered writes keep going past a bad document, so only the reported indices failed
+        failed_indices = sorted({error["index"] for error in e.details.get("writeErrors", [])})
+        logger.error(f"Failed to save {len(failed_indices)} of {len(meeting_data_list)} meetings in batch")
+        return {
+            "success": False,
+            "error": str(e),
+            "failed_indices": failed_indices,
+            "message": "Failed to save part of the meeting data batch"
+        }
+        
+    except Exception as e:
+        logger.error(f"Error saving meeting data batch: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Failed to save meeting data batch"
+        }
+
+
 class MarkEmailReadTool(BaseTool):
     """Tool to mark emails as read in Gmail."""
     
@@ -164,11 +253,24 @@ class MarkEmailReadTool(BaseTool):
         Returns:
             Dictionary with operation results
         """
+        return self._run_batch(message_ids)
+    
+    def _run_batch(self, message_ids: List[str]) -> Dict[str, Any]:
+        """
+        Mark many emails as read with Gmail's batchModify (up to 1000 IDs per call).
+        
+        Only logs unless GMAIL_MARK_READ_ENABLED is set, since removing the
+        UNREAD label needs the gmail.modify scope.
+        """
         try:
-            # This would integrate with Gmail API
-            # For now, we'll return a success response
             logger.info(f"Marking {len(message_ids)} emails as read")
             
+            if LeadManagerConfig.GMAIL_MARK_READ_ENABLED and message_ids:
+                service = _authenticate_gmail_service()
+                if service is None:
+                    raise RuntimeError("Gmail service unavailable")
+                mark_messages_read(service, list(message_ids))
+            
             return {
                 "success": True,
                 "marked_count": len(message_ids),
@@ -201,14 +303,13 @@ class UINotificationTool(BaseTool):
             Dictionary with notification results
         """
         try:
-            ui_client_url = os.getenv("UI_CLIENT_SERVICE_URL", "http://localhost:8000")
-            
-            # Add timestamp and agent type
-            notification_data["timestamp"] = datetime.utcnow().isoformat()
+            # Add timestamp (unless the caller already stamped one) and agent type;
+            # datetimes are serialized as UTC by the notification bus
+            notification_data.setdefault("timestamp", datetime.now(timezone.utc))
             notification_data["agent_type"] = "lead_manager"
             
-            # In a real implementation, this would make an HTTP request to the UI client
             logger.info(f"Sending UI notification: {notification_data.get('message', 'No message')}")
+            notification_bus.enqueue(notification_data)
             
             return {
                 "success": True,
@@ -225,8 +326,101 @@ class UINotificationTool(BaseTool):
             }
 
 
+class AnalyzerCache:
+    """
+    Two-level cache for email analyzer results.
+    
+    An in-process LRU serves repeat lookups within a run; the MongoDB
+    `analyzer_cache` collection (TTL-indexed) persists results across polling runs
+    so replayed or retried emails never hit the LLM twice.
+    """
+    
+    COLLECTION_NAME = "analyzer_cache"
+    
+    def __init__(self, max_size: int = LeadManagerConfig.ANALYZER_CACHE_SIZE,
+                 ttl_seconds: int = LeadManagerConfig.ANALYZER_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._collection = None
+        self._persistent_disabled = False
+    
+    @staticmethod
+    def make_key(email_data: Dict[str, Any]) -> str:
+        """Key by Gmail message_id, falling back to a SHA-256 of subject + body."""
+        message_id = email_data.get("message_id")
+        if message_id:
+            return message_id
+        content = f"{email_data.get('subject', '')}{email_data.get('body', '')}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def _get_collection(self):
+        """Lazily connect and ensure the TTL index; disable persistence on failure."""
+        if self._collection is None and not self._persistent_disabled:
+            try:
+                _, database = get_lead_manager_mongodb_client()
+                collection = database[self.COLLECTION_NAME]
+                collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+                self._collection = collection
+            except Exception as e:
+                logger.warning(f"Analyzer cache persistence disabled: {str(e)}")
+                self._persistent_disabled = True
+        return self._collection
+    
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis result, or None on a miss."""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                return result
+        
+        collection = self._get_collection()
+        if collection is None:
+            return None
+        
+        try:
+            document = collection.find_one({"_id": key})
+        except Exception as e:
+            logger.warning(f"Analyzer cache lookup failed for {key}: {str(e)}")
+            return None
+        
+        if not document:
+            return None
+        
+        result = document.get("result")
+        self._remember(key, result)
+        return result
+    
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store an analysis result in memory and in MongoDB."""
+        self._remember(key, result)
+        
+        collection = self._get_collection()
+        if collection is None:
+            return
+        
+        try:
+            collection.replace_one(
+                {"_id": key},
+                {"_id": key, "result": result, "created_at": datetime.utcnow()},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Analyzer cache write failed for {key}: {str(e)}")
+
+
 # Tool instances for easy import
 check_hot_lead_tool_instance = CheckHotLeadTool()
 save_meeting_tool_instance = SaveMeetingTool()
 mark_email_read_tool_instance = MarkEmailReadTool()
-ui_notification_tool_instance = UINotificationTool()
\ No newline at end of file
+ui_notification_tool_instance = UINotificationTool()
+analyzer_cache = AnalyzerCache()
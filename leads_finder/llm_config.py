@@ -6,6 +6,7 @@ Consolidates Cerebras and OpenAI configurations with lazy loading.
 import os
 from typing import Optional
 from crewai import LLM
+from config.cerebras_client import CerebrasConfig
 
 
 class LLMConfig:
@@ -14,6 +15,7 @@ class LLMConfig:
     # Cerebras API endpoint (OpenAI-compatible)
     CEREBRAS_BASE_URL = os.getenv("CEREBRAS_BASE_URL")
     OPENAI_BASE_URL = "https://api.openai.com/v1"
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     
     @classmethod
     def get_cerebras_llm(
@@ -31,17 +33,12 @@ class LLMConfig:
             **kwargs: Additional LLM parameters
             
         Returns:
-            Configured LLM instance
+            Configured LLM instance (shared with config.cerebras_client's cache)
         """
-        api_key = os.getenv("CEREBRAS_API_KEY")
-        if not api_key:
-            raise ValueError("CEREBRAS_API_KEY environment variable not set")
-
-        return LLM(
+        return CerebrasConfig.get_crewai_llm(
             model=model,
-            api_key=api_key,
-            base_url="https://api.cerebras.ai/v1",
             temperature=temperature,
+            base_url="https://api.cerebras.ai/v1",
             top_p=kwargs.get("top_p", 1),
             max_completion_tokens=kwargs.get("max_completion_tokens", 8192),
             **{k: v for k, v in kwargs.items() if k not in ["top_p", "max_completion_tokens"]}
@@ -65,7 +62,7 @@ class LLMConfig:
         Returns:
             Configured LLM instance
         """
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = cls.OPENAI_API_KEY
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
@@ -18,6 +18,26 @@ from leads_finder.sub_agents.cluster_search_agent import run_cluster_search
 from sdr.agents.sdr_main_agent import execute_sdr_main_workflow
 from sdr.tools.phone_call_tool import phone_call_tool
 
+# Demo searches for the comprehensive analysis menu, keyed by menu choice
+DEMO_QUERIES = (
+    ("restaurants", "New York"),
+    ("coffee shops", "San Francisco"),
+    ("IT services", "Ahmedabad"),
+    ("hotels", "Chicago"),
+    ("pharmacies", "Bangalore"),
+)
+DEMO_CHOICES = {str(i): demo for i, demo in enumerate(DEMO_QUERIES, 1)}
+
+
+def get_missing_api_keys(keys):
+    """Return the keys that are unset or still hold the .env placeholder value."""
+    missing = []
+    for key in keys:
+        value = os.getenv(key)
+        if not value or value == f"your_{key.lower()}_here":
+            missing.append(key)
+    return missing
+
 
 def main():
     """Main entry point for the Agentic Sales Agent."""
@@ -30,7 +50,7 @@ def main():
     required_keys = ["FOURSQUARE_API_KEY", "OPENAI_API_KEY", "CEREBRAS_API_KEY"]
     # Add ElevenLabs keys for calling functionality
     elevenlabs_keys = ["ELEVENLABS_API_KEY", "ELEVENLABS_AGENT_ID", "ELEVENLABS_PHONE_NUMBER_ID"]
-    missing_keys = [key for key in required_keys if not os.getenv(key) or os.getenv(key) == f"your_{key.lower()}_here"]
+    missing_keys = get_missing_api_keys(required_keys)
     
     if missing_keys:
         print(f"Missing required API keys: {', '.join(missing_keys)}")
@@ -38,7 +58,7 @@ def main():
         return
     
     # Check ElevenLabs keys for calling functionality
-    elevenlabs_set = all([os.getenv(key) and os.getenv(key) != f"your_{key.lower()}_here" for key in elevenlabs_keys])
+    elevenlabs_set = not get_missing_api_keys(elevenlabs_keys)
     
     print("API keys configured successfully!")
     if elevenlabs_set:
@@ -178,24 +198,15 @@ def run_comprehensive_analysis():
     
     # Use Cerebras for analysis
     
-    # Demo parameters
-    demo_queries = [
-        ("restaurants", "New York"),
-        ("coffee shops", "San Francisco"),
-        ("IT services", "Ahmedabad"),
-        ("hotels", "Chicago"),
-        ("pharmacies", "Bangalore")
-    ]
-    
     print("Available demo searches:")
-    for i, (query, location) in enumerate(demo_queries, 1):
-        print(f"{i}. {query} in {location}")
+    for key, (query, location) in DEMO_CHOICES.items():
+        print(f"{key}. {query} in {location}")
     
     try:
-        choice = int(input("\nSelect a demo (1-5): ").strip()) - 1
+        demo = DEMO_CHOICES.get(input(f"\nSelect a demo (1-{len(DEMO_CHOICES)}): ").strip())
         
-        if 0 <= choice < len(demo_queries):
-            query, location = demo_queries[choice]
+        if demo:
+            query, location = demo
             
             print(f"\nSearching for {query} in {location}...")
             search_result = search_leads(query, location, radius=2000, limit=10, use_cost_effective=False)
@@ -214,8 +225,6 @@ def run_comprehensive_analysis():
         else:
             print("Invalid choice.")
             
-    except ValueError:
-        print("Invalid input.")
     except Exception as e:
         print(f"Error during analysis: {str(e)}")
 
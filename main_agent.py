@@ -2,6 +2,7 @@
 Main Agent Orchestrator for Sales Development Representative System
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -66,7 +67,7 @@ class MainAgentOrchestrator:
             
             # Step 2: Retrieve stored leads
             logger.info("Step 2: Retrieving stored leads")
-            stored_leads = self._get_stored_leads_from_mongodb()
+            stored_leads = await asyncio.to_thread(self._get_stored_leads_from_mongodb)
             
             if not stored_leads:
                 logger.warning("No stored leads found, workflow cannot continue")
@@ -293,7 +294,11 @@ async def run_main_agent_workflow_with_tracking(
         # Wait for MongoDB upload to complete with comprehensive verification
         upload_completed = False
         if step_tracker and step_tracker.session_id:
-            upload_completed = wait_for_mongodb_upload_completion(step_tracker.session_id, max_wait_seconds=30)
+            # Blocking poll (time.sleep + pymongo) runs in a worker thread so the
+            # event loop keeps serving SSE heartbeats and other requests
+            upload_completed = await asyncio.to_thread(
+                wait_for_mongodb_upload_completion, step_tracker.session_id, max_wait_seconds=30
+            )
             if step_tracker:
                 if upload_completed:
                     await step_tracker.complete_step(
@@ -313,7 +318,9 @@ async def run_main_agent_workflow_with_tracking(
                 "Retrieving stored leads from database..."
             )
         
-        stored_leads = get_stored_leads_from_mongodb(step_tracker.session_id if step_tracker else None)
+        stored_leads = await asyncio.to_thread(
+            get_stored_leads_from_mongodb, step_tracker.session_id if step_tracker else None
+        )
         
         if step_tracker:
             await step_tracker.complete_step(
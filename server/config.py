@@ -16,6 +16,14 @@ class Settings:
     HOST = os.getenv("SERVER_HOST", "0.0.0.0")
     PORT = int(os.getenv("SERVER_PORT", "8000"))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    # "auto" uses uvloop/httptools when installed (uvicorn[standard]) and falls back otherwise
+    LOOP = os.getenv("SERVER_LOOP", "auto")
+    HTTP = os.getenv("SERVER_HTTP", "auto")
+    # Workflow sessions and WebSocket connections are process-local, so keep 1 worker
+    # unless that state is moved out of process
+    WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+    LIMIT_CONCURRENCY = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "0")) or None
+    BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
     
     # CORS Settings
     ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
@@ -23,10 +31,12 @@ class Settings:
     # Rate Limiting
     RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
     RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))  # seconds
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))  # upper bound for ?limit=
     
     # Agent Settings
     MAX_WORKFLOW_RETRIES = int(os.getenv("MAX_WORKFLOW_RETRIES", "3"))
     WORKFLOW_TIMEOUT = int(os.getenv("WORKFLOW_TIMEOUT", "300"))  # seconds
+    MAX_WORKFLOW_SESSIONS = int(os.getenv("MAX_WORKFLOW_SESSIONS", "1000"))
     
     # Email Settings
     EMAIL_RATE_LIMIT = int(os.getenv("EMAIL_RATE_LIMIT", "10"))  # emails per minute
@@ -13,10 +13,19 @@ import json
 import uuid
 from pathlib import Path
 from datetime import datetime
+from collections import OrderedDict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from server.config import settings
+
 # Import agent modules
 from main_agent import run_main_agent_workflow, run_main_agent_workflow_with_tracking
 from workflow_step_tracker import WorkflowStepTracker
@@ -39,19 +48,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _sse_event(payload: Dict[str, Any]):
+    """Encode a payload as a Server-Sent Events frame (orjson fast path when installed)"""
+    if ORJSON_AVAILABLE:
+        return b"data: " + orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+    return f"data: {json.dumps(payload)}\n\n"
+
 # WebSocket connection manager
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.workflow_sessions: Dict[str, Dict] = {}
+    def __init__(self, max_sessions: int = settings.MAX_WORKFLOW_SESSIONS):
+        # Insertion-ordered dict used as an ordered set: O(1) membership and removal
+        self.active_connections: Dict[WebSocket, None] = {}
+        # Bounded LRU of workflow sessions so long-running servers don't grow unbounded
+        self.workflow_sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_sessions = max_sessions
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections[websocket] = None
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         try:
@@ -61,7 +78,7 @@ class ConnectionManager:
 
     async def broadcast_to_session(self, session_id: str, message: str):
         """Broadcast message to all connections following a specific session"""
-        for connection in self.active_connections:
+        for connection in list(self.active_connections):
             try:
                 await connection.send_text(message)
             except:
@@ -77,10 +94,14 @@ class ConnectionManager:
             "steps_completed": [],
             "created_at": datetime.now().isoformat()
         }
+        self.workflow_sessions.move_to_end(session_id)
+        while len(self.workflow_sessions) > self.max_sessions:
+            self.workflow_sessions.popitem(last=False)
 
     def update_workflow_session(self, session_id: str, step: str, status: str, data: Dict = None):
         """Update workflow session progress"""
         if session_id in self.workflow_sessions:
+            self.workflow_sessions.move_to_end(session_id)
             self.workflow_sessions[session_id].update({
                 "current_step": step,
                 "status": status,
@@ -242,7 +263,7 @@ async def start_main_workflow_stream(request: MainWorkflowRequest):
                 "progress": 0,
                 "data": request.dict()
             }
-            yield f"data: {json.dumps(initial_update)}\n\n"
+            yield _sse_event(initial_update)
             
             # Create event queue for real-time communication
             event_queue = asyncio.Queue()
@@ -290,7 +311,7 @@ async def start_main_workflow_stream(request: MainWorkflowRequest):
                                 "timestamp": datetime.now().isoformat(),
                                 "data": event["data"]
                             }
-                            yield f"data: {json.dumps(final_update)}\n\n"
+                            yield _sse_event(final_update)
                             print(f"📡 Sending final event: {final_update['message']}")
                             break
                         elif event.get("type") == "workflow_error":
@@ -302,12 +323,12 @@ async def start_main_workflow_stream(request: MainWorkflowRequest):
                                 "message": f"Workflow failed: {event['error']}",
                                 "timestamp": datetime.now().isoformat()
                             }
-                            yield f"data: {json.dumps(error_update)}\n\n"
+                            yield _sse_event(error_update)
                             print(f"📡 Sending error event: {error_update['message']}")
                             break
                         else:
                             # Send step event immediately (REAL-TIME!)
-                            yield f"data: {json.dumps(event)}\n\n"
+                            yield _sse_event(event)
                             print(f"📡 Sending step event: {event.get('step')} - {event.get('message')}")
                             
                     except asyncio.QueueEmpty:
@@ -331,7 +352,7 @@ async def start_main_workflow_stream(request: MainWorkflowRequest):
                                 "message": f"Workflow running... ({timeout_count}s elapsed)",
                                 "timestamp": datetime.now().isoformat()
                             }
-                            yield f"data: {json.dumps(heartbeat)}\n\n"
+                            yield _sse_event(heartbeat)
                             print(f"📡 Sending heartbeat: {timeout_count}s elapsed")
                         
                         # Short sleep to prevent busy waiting
@@ -347,7 +368,7 @@ async def start_main_workflow_stream(request: MainWorkflowRequest):
                         "message": f"Stream error: {str(e)}",
                         "timestamp": datetime.now().isoformat()
                     }
-                    yield f"data: {json.dumps(error_update)}\n\n"
+                    yield _sse_event(error_update)
                     break
             
             # Clean up
@@ -362,7 +383,7 @@ async def start_main_workflow_stream(request: MainWorkflowRequest):
                 "message": f"Workflow failed: {str(e)}",
                 "timestamp": datetime.now().isoformat()
             }
-            yield f"data: {json.dumps(error_update)}\n\n"
+            yield _sse_event(error_update)
     
     return StreamingResponse(
         generate_workflow_updates(),
@@ -496,6 +517,9 @@ async def get_leads_by_session(session_id: str, limit: int = 10, offset: int = 0
     Returns:
         List of leads for the specified session
     """
+    limit = max(1, min(limit, settings.MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    
     try:
         from main_agent import get_stored_leads_from_mongodb
         
@@ -535,6 +559,9 @@ async def get_all_leads(limit: int = 50, offset: int = 0, with_email_only: bool
     Returns:
         List of all leads with pagination
     """
+    limit = max(1, min(limit, settings.MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    
     try:
         from leads_finder.database import get_business_leads_collection
         
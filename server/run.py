@@ -22,6 +22,11 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        loop=settings.LOOP,
+        http=settings.HTTP,
+        workers=settings.WORKERS,
+        limit_concurrency=settings.LIMIT_CONCURRENCY,
+        backlog=settings.BACKLOG,
         log_level=settings.LOG_LEVEL.lower(),
         access_log=True
     )
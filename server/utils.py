@@ -3,6 +3,7 @@ Utility functions for the server
 """
 import asyncio
 import logging
+from collections import deque
 from typing import Dict, Any, Optional
 from datetime import datetime
 import json
@@ -20,28 +21,28 @@ class RateLimiter:
     def __init__(self, max_requests: int, window_seconds: int):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = {}
+        self.requests: Dict[str, deque] = {}
     
     def is_allowed(self, client_id: str) -> bool:
         """Check if request is allowed based on rate limit"""
-        now = datetime.now()
-        window_start = now.timestamp() - self.window_seconds
+        now = datetime.now().timestamp()
+        window_start = now - self.window_seconds
         
-        # Clean old requests
-        if client_id in self.requests:
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if req_time > window_start
-            ]
-        else:
-            self.requests[client_id] = []
+        # Each client keeps a ring buffer of at most max_requests timestamps
+        timestamps = self.requests.get(client_id)
+        if timestamps is None:
+            timestamps = self.requests[client_id] = deque(maxlen=self.max_requests)
+        
+        # Clean old requests (oldest are always at the left)
+        while timestamps and timestamps[0] <= window_start:
+            timestamps.popleft()
         
         # Check rate limit
-        if len(self.requests[client_id]) >= self.max_requests:
+        if len(timestamps) >= self.max_requests:
             return False
         
         # Add current request
-        self.requests[client_id].append(now.timestamp())
+        timestamps.append(now)
         return True
 
 def validate_business_data(data: Dict[str, Any]) -> Dict[str, Any]: